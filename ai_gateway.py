@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import metrics, percentile
+
+# Every outbound LLM call in the process goes through one gateway: a fixed
+# number of worker threads (the concurrency cap) drain a FIFO queue, each call
+# takes a token from a shared bucket before it starts, and identical prompts
+# already in flight share one upstream stream.
+
+AI_MAX_CONCURRENCY = 4
+AI_RATE_PER_SEC = 2.0   # sustained upstream calls per second
+AI_BURST = 4            # calls allowed back-to-back before the rate applies
+WAIT_SAMPLES = 1000
+
+
+class TokenBucket:
+    def __init__(self, rate=AI_RATE_PER_SEC, burst=AI_BURST, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Reserve one token, sleeping until it is available. Returns the wait."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is a reservation: later callers queue behind it.
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+class _Broadcast:
+    """Chunks of one upstream stream, replayable by any number of readers."""
+
+    def __init__(self):
+        self._chunks = []
+        self._done = False
+        self._error = None
+        self._cond = threading.Condition()
+
+    def publish(self, chunk):
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    def __iter__(self):
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self._chunks) and not self._done:
+                    self._cond.wait()
+                if i < len(self._chunks):
+                    chunk = self._chunks[i]
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            i += 1
+            yield chunk
+
+
+class AIGateway:
+    """Concurrency cap, token-bucket rate limit and request coalescing.
+
+    Upstream streams run on the gateway's own workers, so a session that
+    stops reading (a rerun, a closed dialog) never stalls the others sharing
+    that stream.
+    """
+
+    def __init__(self, max_concurrency=AI_MAX_CONCURRENCY, rate=AI_RATE_PER_SEC, burst=AI_BURST):
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ai-gateway")
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self._queued = 0
+        self._active = 0
+        self.requests = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def stream(self, key, open_stream):
+        """Iterate the chunks of `open_stream()`, shared with identical `key`s."""
+        with self._lock:
+            broadcast = self._inflight.get(key)
+            if broadcast is None:
+                broadcast = self._inflight[key] = _Broadcast()
+                self._queued += 1
+                self.requests += 1
+                self._executor.submit(self._run, key, broadcast, open_stream, time.monotonic())
+            else:
+                self.coalesced += 1
+        return iter(broadcast)
+
+    def _run(self, key, broadcast, open_stream, submitted):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            self.bucket.take()
+            self._waits.append(time.monotonic() - submitted)
+            with metrics.span("gemini_stream"):
+                for chunk in open_stream():
+                    broadcast.publish(chunk)
+            broadcast.finish()
+        except BaseException as e:
+            self.errors += 1
+            broadcast.finish(e)
+        finally:
+            with self._lock:
+                self._active -= 1
+                if self._inflight.get(key) is broadcast:
+                    del self._inflight[key]
+
+    def stats(self):
+        with self._lock:
+            waits = list(self._waits)
+            return {
+                "queue_depth": self._queued,
+                "active": self._active,
+                "inflight_keys": len(self._inflight),
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "wait_p50": percentile(waits, 0.50),
+                "wait_p95": percentile(waits, 0.95),
+                "wait_max": max(waits, default=0.0),
+            }
+
+
+ai_gateway = AIGateway()
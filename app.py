@@ -1,18 +1,10 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import yfinance as yf
-import time
-import smtplib
-import requests
-import xml.etree.ElementTree as ET
-import streamlit.components.v1 as components
-import google.generativeai as genai 
-import plotly.graph_objects as go 
-from plotly.subplots import make_subplots 
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from datetime import datetime
+
+from metrics import metrics, start_metrics_server
+from static_content import load_css
+
+# Subsystem modules (market, AI, mail, news) and their heavy dependencies are
+# imported where they are first used, so the cover page never loads them.
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -22,218 +14,69 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# --- SESSION STATE ---
-if 'page' not in st.session_state:
-    st.session_state.page = 'cover'
-
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
-
-def enter_site():
-    st.session_state.page = 'main'
+# --- PAGES ---
+# Each view is its own script; a rerun executes the shared chrome below plus
+# the active page only.
+cover_page = st.Page("views/cover.py", title="Bit Solutions Academy", icon="🎓", default=True)
+academy_pages = [
+    st.Page("views/news_feed.py", title="Crypto News", icon="⚡"),
+    st.Page("views/market.py", title="Live Market", icon="💎"),
+    st.Page("views/compare.py", title="Compare Pairs", icon="📊"),
+    st.Page("views/learn.py", title="Learn Concepts", icon="🎓"),
+    st.Page("views/quiz.py", title="Knowledge Quiz", icon="🧩"),
+]
+# Not linked anywhere; reachable at /admin.
+admin_page = st.Page("views/admin.py", title="Admin", icon="🛠️", url_path="admin")
+page = st.navigation([cover_page, *academy_pages, admin_page], position="hidden")
+
+# --- TIMING ---
+# Spans recorded from here until the page finishes form this rerun's breakdown.
+metrics.begin_rerun(page.url_path or "cover")
+if "metrics" in st.secrets and "port" in st.secrets["metrics"]:
+    start_metrics_server(int(st.secrets["metrics"]["port"]))
 
 # --- API CONFIGURATION (SILENT LOAD) ---
-api_configured = False
-if "gemini" in st.secrets and "api_key" in st.secrets["gemini"]:
-    try:
-        genai.configure(api_key=st.secrets["gemini"]["api_key"])
-        api_configured = True
-    except Exception as e:
-        pass
+# The Gemini client itself is configured on the first chat request.
+api_configured = "gemini" in st.secrets and "api_key" in st.secrets["gemini"]
 
 # --- EMAIL FUNCTION ---
 def send_email(user_email, user_message):
     if "email" not in st.secrets:
         return False
     try:
-        sender_email = st.secrets["email"]["sender_email"]
-        sender_password = st.secrets["email"]["sender_password"]
-        receiver_email = st.secrets["email"]["receiver_email"]
-
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = receiver_email
-        msg['Subject'] = f"New Inquiry from {user_email}"
-
-        body = f"User Email: {user_email}\n\nMessage:\n{user_message}"
-        msg.attach(MIMEText(body, 'plain'))
-
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-        text = msg.as_string()
-        server.sendmail(sender_email, receiver_email, text)
-        server.quit()
-        return True
+        from mailer import get_mail_queue
+        email_cfg = st.secrets["email"]
+        options = {}
+        if "smtp_host" in email_cfg: options["host"] = email_cfg["smtp_host"]
+        if "smtp_port" in email_cfg: options["port"] = int(email_cfg["smtp_port"])
+        if "smtp_starttls" in email_cfg: options["starttls"] = bool(email_cfg["smtp_starttls"])
+        with metrics.span("email_send"):
+            mail_queue = get_mail_queue(email_cfg["sender_email"], email_cfg["sender_password"],
+                                        email_cfg["receiver_email"], **options)
+            return mail_queue.submit(user_email, user_message)
     except Exception as e:
         return False
 
-# --- NEWS FETCHING FUNCTION (RSS) ---
-def get_crypto_news():
-    url = "https://cointelegraph.com/rss"
-    news_items = []
-    try:
-        response = requests.get(url, timeout=5)
-        root = ET.fromstring(response.content)
-        for item in root.findall('./channel/item')[:10]:
-            news = {
-                'title': item.find('title').text,
-                'link': item.find('link').text,
-                'pubDate': item.find('pubDate').text,
-                'source': 'Cointelegraph'
-            }
-            news_items.append(news)
-    except Exception as e:
-        return []
-    return news_items
-
-# --- HELPER: CALCULATE RSI ---
-def calculate_rsi(data, window=14):
-    delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
-
 # --- CUSTOM CSS ---
-st.markdown("""
-    <style>
-    /* BACKGROUND IMAGE SETTINGS */
-    .stApp {
-        background-image: linear-gradient(rgba(0, 0, 0, 0.7), rgba(0, 0, 0, 0.9)), 
-                          url('https://images.unsplash.com/photo-1639322537228-f710d846310a?auto=format&fit=crop&q=80');
-        background-size: cover;
-        background-position: center;
-        background-attachment: fixed;
-    }
-    
-    /* Text Readability */
-    h1, h2, h3 { 
-        color: #FFFFFF !important; 
-        text-shadow: 0px 4px 4px rgba(0,0,0,0.8);
-        font-weight: 700 !important;
-    }
-    p, li, label, div { 
-        color: #E6E6E6 !important; 
-        font-weight: 500 !important; 
-        line-height: 1.6; 
-    }
-    
-    /* --- FIX: DROPDOWN MENU VISIBILITY --- */
-    
-    /* 1. The Box Itself (Closed) */
-    div[data-baseweb="select"] > div {
-        background-color: #1a1a1d !important;
-        color: white !important;
-        border-color: #555 !important;
-    }
-    
-    /* 2. The Text inside the box */
-    div[data-baseweb="select"] span {
-        color: white !important;
-    }
-    
-    /* 3. The Popup Menu (Open State) - FORCE DARK BACKGROUND */
-    div[data-baseweb="popover"] {
-        background-color: #2b2b2b !important;
-    }
-    
-    /* 4. The Options List inside the Popup */
-    div[data-baseweb="menu"] {
-        background-color: #2b2b2b !important;
-    }
-    
-    /* 5. The Option Text */
-    div[data-baseweb="menu"] li {
-        color: white !important;
-        background-color: #2b2b2b !important;
-    }
-    
-    /* 6. Hover Highlight Effect */
-    div[data-baseweb="menu"] li:hover {
-        background-color: #00BFA5 !important; /* Teal Highlight */
-        color: white !important;
-    }
-    
-    /* 7. Selected Option Highlight */
-    div[data-baseweb="menu"] li[aria-selected="true"] {
-        background-color: #00BFA5 !important;
-    }
-    /* ------------------------------------- */
-
-    /* Buttons */
-    div.stButton > button {
-        background-color: #00BFA5;
-        color: white;
-        border: none;
-        padding: 10px 24px;
-        font-size: 1.2em;
-        font-weight: 600;
-        border-radius: 8px;
-        transition: all 0.3s;
-        box-shadow: 0px 4px 10px rgba(0, 191, 165, 0.3);
-    }
-    div.stButton > button:hover {
-        background-color: #00E5C0;
-        box-shadow: 0px 0px 15px #00BFA5;
-        transform: translateY(-2px);
-    }
-    
-    /* Sidebar */
-    section[data-testid="stSidebar"] {
-        background-color: rgba(20, 20, 25, 0.95);
-        border-right: 1px solid #343A40;
-    }
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] { gap: 10px; }
-    .stTabs [data-baseweb="tab"] {
-        background-color: rgba(255, 255, 255, 0.05);
-        color: #ADB5BD;
-        border-radius: 5px;
-        border: 1px solid rgba(255,255,255,0.1);
-    }
-    .stTabs [aria-selected="true"] {
-        background-color: #00BFA5;
-        color: #FFFFFF !important;
-        font-weight: bold;
-        border-color: #00BFA5;
-    }
-    
-    /* Metric Cards */
-    div[data-testid="stMetric"] {
-        background-color: rgba(255, 255, 255, 0.05);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        padding: 15px;
-        border-radius: 10px;
-    }
-    
-    /* AI Agent Modal - Dark Background Fix */
-    div[role="dialog"] {
-        background-color: #1a1a1d !important;
-        color: white !important;
-        border: 1px solid #333;
-    }
-    
-    /* Code Block */
-    code {
-        color: #e83e8c;
-        background-color: #212529;
-        padding: 2px 4px;
-        border-radius: 4px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # --- ☁️ FLOATING CHAT DIALOG ---
 @st.dialog("☁️ Cloud Agent")
 def show_chat_dialog():
+    from assistant import Conversation, chat_responder, configure_gemini
     st.caption("I am your floating assistant. Ask me anything!")
-    for message in st.session_state.chat_history:
+    if "conversation" not in st.session_state:
+        st.session_state.conversation = Conversation()
+    conversation = st.session_state.conversation
+    if conversation.hidden_count():
+        st.button(f"Show older messages ({conversation.hidden_count()})", on_click=conversation.show_older)
+    for message in conversation.window():
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     if prompt := st.chat_input("Ask a question..."):
-        st.session_state.chat_history.append({"role": "user", "content": prompt})
+        model_prompt = conversation.model_prompt(prompt) if conversation.has_history else None
+        conversation.append("user", prompt)
+        conversation.reset_window()
         with st.chat_message("user"):
             st.markdown(prompt)
         if not api_configured:
@@ -242,16 +85,14 @@ def show_chat_dialog():
             with st.chat_message("assistant"):
                 message_placeholder = st.empty()
                 try:
-                    model = genai.GenerativeModel('gemini-2.5-flash')
-                    context_prompt = f"You are a crypto expert. Answer concise: {prompt}"
+                    configure_gemini(st.secrets["gemini"]["api_key"])
                     full_response = ""
-                    response = model.generate_content(context_prompt, stream=True)
-                    for chunk in response:
-                        if chunk.text:
-                            full_response += chunk.text
+                    with metrics.span("chat_call"):
+                        for chunk in chat_responder.stream(prompt, model_prompt):
+                            full_response += chunk
                             message_placeholder.markdown(full_response + "▌")
                     message_placeholder.markdown(full_response)
-                    st.session_state.chat_history.append({"role": "assistant", "content": full_response})
+                    conversation.append("assistant", full_response)
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
@@ -281,37 +122,15 @@ with st.sidebar:
         submit_button = st.form_submit_button("Send")
     if submit_button:
         if contact_email and contact_msg:
-            with st.spinner("Sending..."):
-                time.sleep(1)
-                success = send_email(contact_email, contact_msg)
-                if success: st.success("✅ Sent!")
-                elif "email" not in st.secrets: st.success("✅ Simulated!")
-                else: st.error("❌ Error.")
+            success = send_email(contact_email, contact_msg)
+            if success: st.success("✅ Sent!")
+            elif "email" not in st.secrets: st.success("✅ Simulated!")
+            else: st.error("❌ Error.")
 
 # ==========================================
-# PAGE 1: COVER
-# ==========================================
-if st.session_state.page == 'cover':
-    c1, c2, c3 = st.columns([1, 2, 1])
-    with c2:
-        st.write("")
-        st.write("")
-        st.write("")
-        st.write("")
-        st.title("BIT SOLUTIONS ACADEMY")
-        st.markdown("<h3 style='text-align: left; color: #00BFA5 !important;'>Master the Future of Finance.</h3>", unsafe_allow_html=True)
-        st.write("Welcome to the next generation of financial education. Learn how Blockchain, Smart Contracts, and DeFi are rewriting the rules of money.")
-        st.write("")
-        st.write("---")
-        st.write("")
-        if st.button("🚀 Enter Academy"):
-            enter_site()
-            st.rerun()
-
+# ACADEMY HEADER & NAVIGATION
 # ==========================================
-# PAGE 2: MAIN
-# ==========================================
-else:
+if page is not cover_page:
     col1, col2 = st.columns([3, 1])
     with col1:
         st.title("BIT SOLUTIONS ACADEMY")
@@ -320,322 +139,14 @@ else:
         if st.button("☁️ Launch AI Agent", type="primary", use_container_width=True, key="dashboard_agent"):
             show_chat_dialog()
         if st.button("⬅ Exit to Cover", use_container_width=True):
-            st.session_state.page = 'cover'
-            st.rerun()
-
-    st.markdown("---")
-
-    # --- NAVIGATION ---
-    tab_news, tab_data, tab_learn, tab_quiz = st.tabs(["⚡ Crypto News", "💎 Live Market", "🎓 Learn Concepts", "🧩 Knowledge Quiz"])
-
-    # --- TAB 1: NEWS ---
-    with tab_news:
-        st.header("⚡ Global Crypto News")
-        st.write("Live feed from **Cointelegraph**.")
-        col_news1, col_news2 = st.columns([2, 1])
-        with col_news1:
-            st.subheader("Latest Headlines")
-            news_list = get_crypto_news()
-            if news_list:
-                for item in news_list:
-                    with st.container():
-                        st.markdown(f"#### [{item['title']}]({item['link']})")
-                        st.caption(f"**{item['source']}** | 🕒 {item['pubDate']}")
-                        st.markdown("---")
-            else:
-                st.info("Loading news... (If this takes too long, check connection)")
-        with col_news2:
-            st.subheader("Educational: How to Read News")
-            with st.expander("🟢 Bullish vs 🔴 Bearish"):
-                st.write("**Bullish:** Good news (Adoption, New Tech). Price often goes UP.")
-                st.write("**Bearish:** Bad news (Hacks, Bans). Price often goes DOWN.")
-            with st.expander("⚠️ FUD vs. FOMO"):
-                st.write("**FUD:** Fake fear to make you sell.")
-                st.write("**FOMO:** Fake hype to make you buy.")
-            st.info("💡 **Pro Tip:** Never trade immediately on a headline. Wait 15 minutes.")
+            st.switch_page(cover_page)
 
-    # --- TAB 2: LIVE MARKET (REVAMPED) ---
-    with tab_data:
-        st.header("💎 Professional Market Terminal")
-        
-        # 1. Top Controls
-        c_sel, c_time, c_type = st.columns([2, 1, 1])
-        with c_sel:
-            coin_opt = st.selectbox("Select Asset Pair:", 
-                                    ["Bitcoin (BTC-USD)", "Ethereum (ETH-USD)", "Solana (SOL-USD)", "Cardano (ADA-USD)", "Ripple (XRP-USD)", "Dogecoin (DOGE-USD)"])
-            ticker_symbol = coin_opt.split('(')[1][:-1] # Extracts "BTC-USD"
-        with c_time:
-            timeframe = st.selectbox("Timeframe", ["1mo", "3mo", "6mo", "1y", "ytd"], index=1)
-        with c_type:
-            chart_type = st.selectbox("Chart Type", ["Candlestick", "Line"])
+    for nav_col, academy_page in zip(st.columns(len(academy_pages)), academy_pages):
+        nav_col.page_link(academy_page)
 
-        # 2. Data Fetching
-        try:
-            ticker_data = yf.Ticker(ticker_symbol)
-            df = ticker_data.history(period=timeframe)
-            
-            if not df.empty:
-                # Calculate Indicators
-                df['SMA_20'] = df['Close'].rolling(window=20).mean()
-                df['RSI'] = calculate_rsi(df)
-                
-                # Current Metrics
-                curr_price = df['Close'].iloc[-1]
-                prev_price = df['Close'].iloc[-2]
-                day_high = df['High'].iloc[-1]
-                day_low = df['Low'].iloc[-1]
-                price_change = curr_price - prev_price
-                pct_change = (price_change / prev_price) * 100
-                current_rsi = df['RSI'].iloc[-1]
-
-                # 3. KPI Row
-                kpi1, kpi2, kpi3, kpi4 = st.columns(4)
-                kpi1.metric("Current Price", f"${curr_price:,.2f}", f"{pct_change:.2f}%")
-                kpi2.metric("24h High", f"${day_high:,.2f}")
-                kpi3.metric("24h Low", f"${day_low:,.2f}")
-                
-                # RSI Logic Badge
-                rsi_state = "Neutral 😐"
-                if current_rsi > 70: rsi_state = "Overbought (Sell Risk) 🔴"
-                elif current_rsi < 30: rsi_state = "Oversold (Buy Opp) 🟢"
-                kpi4.metric("RSI (14)", f"{current_rsi:.1f}", rsi_state, delta_color="off")
-
-                # <--- EDUCATIONAL GUIDE --->
-                with st.expander("📘 How to Read These Charts"):
-                    st.write("**1. Candlesticks (The Bars):**")
-                    st.caption("Each bar shows the price movement for one day.")
-                    st.write("* **Green Candle:** Price went UP (Closed higher than it opened).")
-                    st.write("* **Red Candle:** Price went DOWN (Closed lower than it opened).")
-                    st.write("* **Wicks (Lines):** The highest and lowest price reached that day.")
-                    st.divider()
-                    st.write("**2. SMA (Simple Moving Average) - The Orange Line:**")
-                    st.caption("This smoothes out the price action to show the trend.")
-                    st.write("* **Price Above Orange Line:** Generally considered an **UPTREND** (Bullish).")
-                    st.write("* **Price Below Orange Line:** Generally considered a **DOWNTREND** (Bearish).")
-                    st.divider()
-                    st.write("**3. RSI (Relative Strength Index) - The Purple Graph:**")
-                    st.caption("This measures momentum (speed of price change) on a scale of 0 to 100.")
-                    c_rsi1, c_rsi2 = st.columns(2)
-                    with c_rsi1:
-                        st.error("🔴 Overbought (>70)")
-                        st.write("The price rose too fast. Traders might sell soon. **Risk of Drop.**")
-                    with c_rsi2:
-                        st.success("🟢 Oversold (<30)")
-                        st.write("The price fell too hard. Traders might buy. **Potential Bounce.**")
-                # <--- END GUIDE --->
-
-                st.markdown("---")
-
-                # 4. Professional Charting (Plotly)
-                fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
-                                    vertical_spacing=0.05, row_heights=[0.7, 0.3])
-
-                # Main Chart (Candles)
-                if chart_type == "Candlestick":
-                    fig.add_trace(go.Candlestick(x=df.index,
-                                    open=df['Open'], high=df['High'],
-                                    low=df['Low'], close=df['Close'], name='OHLC'), row=1, col=1)
-                else:
-                    fig.add_trace(go.Scatter(x=df.index, y=df['Close'], 
-                                             mode='lines', name='Price', line=dict(color='#00BFA5')), row=1, col=1)
-                
-                # Add SMA
-                fig.add_trace(go.Scatter(x=df.index, y=df['SMA_20'], 
-                                         mode='lines', name='SMA 20', line=dict(color='orange', width=1)), row=1, col=1)
-
-                # RSI Sub-chart
-                fig.add_trace(go.Scatter(x=df.index, y=df['RSI'], 
-                                         name='RSI', line=dict(color='#A020F0')), row=2, col=1)
-                
-                # RSI Lines
-                fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
-                fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
-
-                # Layout styling
-                fig.update_layout(
-                    height=600,
-                    margin=dict(l=20, r=20, t=30, b=20),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0.1)',
-                    font=dict(color="white"),
-                    xaxis_rangeslider_visible=False
-                )
-                fig.update_xaxes(showgrid=False)
-                fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.1)')
-                
-                st.plotly_chart(fig, use_container_width=True)
-
-            else:
-                st.warning("Loading data...")
-        except Exception as e:
-            st.error(f"Error loading market data: {e}")
-
-        # 5. TradingView Widget (Bottom for Quick Reference)
-        with st.expander("🌍 View Global TradingView Chart"):
-            tv_sym = ticker_symbol.replace("-", "") # Convert BTC-USD to BTCUSD
-            components.html(f"""
-            <div class="tradingview-widget-container">
-              <div id="tradingview_chart"></div>
-              <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
-              <script type="text/javascript">
-              new TradingView.widget(
-              {{ "width": "100%", "height": 500, "symbol": "COINBASE:{tv_sym}", "interval": "D", "timezone": "Etc/UTC", "theme": "dark", "style": "1", "locale": "en", "toolbar_bg": "#f1f3f6", "enable_publishing": false, "allow_symbol_change": true, "container_id": "tradingview_chart" }}
-              );
-              </script>
-            </div>
-            """, height=510)
-
-    # --- TAB 3: LEARN CONCEPTS ---
-    with tab_learn:
-        st.header("Blockchain Fundamentals")
-        # --- LESSON 1: BITCOIN DEEP DIVE ---
-        with st.expander("Lesson 1: What is Bitcoin? (The Digital Gold)", expanded=True):
-            st.subheader("1. The Origin Story")
-            st.write("In 2008, the global economy collapsed. Banks gambled with people's money, governments printed trillions to bail them out, and normal people lost their savings.")
-            st.info("👤 **Satoshi Nakamoto:** On Oct 31, 2008, an anonymous genius released the **Bitcoin Whitepaper**. It wasn't just a new money; it was a protest against the corrupt banking system.")
-            
-            st.link_button("📜 Read the Bitcoin Whitepaper", "https://bitcoin.org/bitcoin.pdf")
-            
-            st.divider()
-            
-            st.subheader("2. What exactly IS Bitcoin?")
-            st.write("Forget the technical jargon for a second. Think of it like this:")
-            
-            c_analogy1, c_analogy2 = st.columns(2)
-            with c_analogy1:
-                st.success("📒 The Giant Public Notebook")
-                st.write("Imagine a notebook shared by everyone in the world. When Alice sends Bob 5 BTC, she writes it in the notebook. Everyone sees it. Everyone agrees. **No bank is needed to verify it.**")
-            with c_analogy2:
-                st.warning("🪙 Digital Gold")
-                st.write("Like gold, Bitcoin is scarce. There will only ever be **21 Million** Bitcoins. Governments cannot print more to cause inflation. It is the first 'absolute scarce' digital object.")
-
-            st.divider()
-
-            st.subheader("3. Who controls it? (No Boss)")
-            st.write("This is the hardest part to understand: **No one controls Bitcoin.**")
-            st.markdown("""
-            * **No CEO:** You can't fire the CEO of Bitcoin.
-            * **No Server:** It doesn't run on Amazon Web Services. It runs on thousands of home computers.
-            * **Censorship Resistant:** If you want to send money to your family in another country, no government or bank can stop you.
-            """)
-
-            st.divider()
-
-            st.subheader("4. How does Mining work? (The Digital Lottery)")
-            st.write("Mining is not about digging. It is about **Security**.")
-            st.markdown("""
-            1.  **The Puzzle:** Every 10 minutes, the Bitcoin network creates a super-hard math puzzle.
-            2.  **The Race:** Thousands of computers (Miners) race to solve it.
-            3.  **The Reward:** The winner gets to add the next page to the 'Public Notebook' (Block) and is paid in new Bitcoin.
-            4.  **The Security:** To hack the network, you would need to beat all the computers in the world at this math puzzle simultaneously. It is mathematically impossible.
-            """)
-
-        # --- LESSON 2: BLOCKCHAIN ARCHITECTURE ---
-        with st.expander("Lesson 2: What is a Blockchain? (Types & Layers)", expanded=False):
-            st.subheader("1. It's Not Just Bitcoin")
-            st.write("Bitcoin was the *first* blockchain, but now there are thousands. Think of Blockchain as the **Operating System** (like Windows or iOS), and Bitcoin as just one **App** running on it.")
-            st.write("")
-            
-            st.divider()
-            
-            st.subheader("2. The Three Main Types")
-            st.write("Not all blockchains are public. Here is how they differ:")
-            
-            c_type1, c_type2, c_type3 = st.columns(3)
-            with c_type1:
-                st.success("🌍 Public (Permissionless)")
-                st.write("**Examples:** Bitcoin, Ethereum, Solana.")
-                st.write("**Who can join?** Anyone.")
-                st.write("**Pros:** Totally transparent, censorship-resistant.")
-                st.write("**Cons:** Can be slow and expensive.")
-            with c_type2:
-                st.info("🏢 Private (Permissioned)")
-                st.write("**Examples:** Hyperledger, R3 Corda.")
-                st.write("**Who can join?** Only invited members (Banks, Supply Chains).")
-                st.write("**Pros:** Fast, private data.")
-                st.write("**Cons:** Centralized (Trust required).")
-            with c_type3:
-                st.warning("🤝 Hybrid")
-                st.write("**Examples:** Dragonchain.")
-                st.write("**Concept:** A mix of both. Public for verification, private for sensitive data.")
-
-            st.divider()
-
-            st.subheader("3. The Scaling Problem (Why is it slow?)")
-            st.write("Imagine a single highway lane (Layer 1) trying to process every transaction in the world. It gets jammed. This is the **Blockchain Trilemma**: You usually have to sacrifice Speed to get Security.")
-
-            st.subheader("4. The Solution: Layer 2 (L2)")
-            st.write("**Layer 1 (L1):** The Main Settlement Layer (e.g., Ethereum). It is secure but expensive.")
-            st.write("**Layer 2 (L2):** The Express Lane built *on top* of L1.")
-            st.write("")
-            
-            st.info("💡 **The Bar Tab Analogy:**")
-            st.write("1. **Layer 1:** You pay for every single drink with a credit card transaction. (Slow, high fees).")
-            st.write("2. **Layer 2:** You open a tab. You order 10 drinks instantly (L2). At the end of the night, you settle the *total* bill once on the main credit card machine (L1).")
-            
-            st.write("**Real World L2 Examples:**")
-            st.markdown("""
-            * **Optimism & Arbitrum:** These 'roll up' hundreds of transactions into one bundle and post it to Ethereum.
-            * **Lightning Network:** Allows for instant, nearly free Bitcoin payments.
-            * **Base:** Coinbase's L2 chain that makes using crypto as cheap as sending an email.
-            """)
-
-        # --- LESSON 3 ---
-        with st.expander("Lesson 3: Staking & Yield"):
-            st.subheader("1. Ways to Earn")
-            st.write("**Staking:** Secure the network (Low Risk). **Lending:** Loan to others (Med Risk).")
-            st.success("Liquid Staking: Get a receipt token (JitoSOL) so you stay liquid while earning.")
-
-        # --- LESSON 4 ---
-        with st.expander("Lesson 4: Wallets (Hot vs Cold)"):
-            st.subheader("Hot vs. Cold")
-            st.write("**Hot (Phantom):** Connected to internet. Good for spending.")
-            st.write("**Cold (Ledger):** Offline. Good for savings.")
-            st.error("🔴 **Private Key:** Never share this. It is your master password.")
-
-        # --- LESSON 5 ---
-        with st.expander("Lesson 5: Security Masterclass"):
-            st.success("✅ **DO:** Write seed phrase on paper. Check URLs.")
-            st.error("❌ **DON'T:** Store seed phrase in cloud. Click DM links.")
+    st.markdown("---")
 
-    # --- TAB 4: QUIZ ---
-    with tab_quiz:
-        st.header("🧠 Knowledge Check")
-        st.write("Test your mastery of the Academy material. Can you get a perfect 10/10?")
-        with st.form("quiz_form"):
-            score = 0
-            st.subheader("Part 1: The Basics")
-            q1 = st.radio("1. Where is your crypto actually stored?", ["On the Blockchain", "In my hardware wallet", "In the Coinbase app"], index=None)
-            q2 = st.radio("2. Who controls the Blockchain ledger?", ["The Bank", "No one (Distributed Network)", "Google"], index=None)
-            q3 = st.radio("3. What is a 'Smart Contract' best compared to?", ["A Lawyer", "A Vending Machine", "A Handshake"], index=None)
-            st.markdown("---")
-            st.subheader("Part 2: Wallets & Security")
-            q4 = st.radio("4. Which wallet type is safest for long-term storage?", ["Hot Wallet", "Cold Wallet", "Exchange Account"], index=None)
-            q5 = st.radio("5. What should you do with your Seed Phrase?", ["Save it in Google Drive", "Screenshot it", "Write it on paper/metal & hide it"], index=None)
-            q6 = st.radio("6. Will legitimate Crypto Support ever DM you first?", ["Yes, to help me", "No, NEVER"], index=None)
-            st.markdown("---")
-            st.subheader("Part 3: Advanced Concepts")
-            q7 = st.radio("7. What is 'Staking'?", ["Selling your coins", "Earning interest by securing the network", "Mining Bitcoin"], index=None)
-            q8 = st.radio("8. What does 'Bullish' mean in market terms?", ["Prices going DOWN", "Prices going UP", "Market is flat"], index=None)
-            q9 = st.radio("9. What pays for a transaction on the network?", ["Gas Fees", "Subscription Fees", "It is free"], index=None)
-            q10 = st.radio("10. Can you reverse a blockchain transaction?", ["Yes, call support", "No, it is immutable (permanent)"], index=None)
-            st.markdown("---")
-            submitted = st.form_submit_button("Submit Answers")
-            if submitted:
-                if q1 == "On the Blockchain": score += 1
-                if q2 == "No one (Distributed Network)": score += 1
-                if q3 == "A Vending Machine": score += 1
-                if q4 == "Cold Wallet": score += 1
-                if q5 == "Write it on paper/metal & hide it": score += 1
-                if q6 == "No, NEVER": score += 1
-                if q7 == "Earning interest by securing the network": score += 1
-                if q8 == "Prices going UP": score += 1
-                if q9 == "Gas Fees": score += 1
-                if q10 == "No, it is immutable (permanent)": score += 1
-                if score == 10:
-                    st.balloons()
-                    st.success(f"🏆 PERFECT SCORE! 10/10. You are a true Crypto Master.")
-                elif score >= 7:
-                    st.success(f"✅ Great Job! You got {score}/10. You are ready to start.")
-                else:
-                    st.error(f"⚠️ You got {score}/10. Please review the lessons and try again.")
+try:
+    page.run()
+finally:
+    metrics.end_rerun()
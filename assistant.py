@@ -0,0 +1,308 @@
+import re
+import threading
+import zlib
+from collections import deque
+
+import numpy as np
+
+from ai_gateway import ai_gateway
+from cache import TTLCache
+from shared_state import SharedCache
+
+# Cloud Agent backend. One model handle per process, and answers cached by
+# normalized prompt so repeated student questions skip the LLM round-trip.
+
+CHAT_MODEL = 'gemini-2.5-flash'
+CHAT_CACHE_TTL = 24 * 60 * 60          # seconds an answer stays reusable
+CHAT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+SEMANTIC_THRESHOLD = 0.9               # cosine similarity for a near-duplicate hit
+# Words a rephrasing may add, drop or reorder; every other word must match.
+STOP_WORDS = frozenset(
+    "a an the is are was were be do does did what whats how why when where which who can could would should "
+    "i me my you your it its of in on for to and or with about please tell explain".split()
+)
+# A prompt with one of these words, opening with one of these connectives
+# or this short may lean on earlier turns ("why?", "and Solana?").
+FOLLOW_UP_WORDS = frozenset(
+    "it its this that these those they them their there he she him her above previous earlier again more else "
+    "same such one ones".split()
+)
+FOLLOW_UP_OPENERS = frozenset({"and", "but", "so", "also", "then", "what about", "how about"})
+FOLLOW_UP_MIN_WORDS = 3
+EMBEDDING_DIM = 512
+
+CHAT_MAX_TURNS = 50        # messages kept per session
+CHAT_TOKEN_BUDGET = 1500   # model context per request
+CHAT_SUMMARY_BUDGET = 300  # part of the budget older turns are squeezed into
+CHAT_PAGE_SIZE = 10        # messages rendered per page in the dialog
+GIST_CHARS = 160
+
+_WORDS = re.compile(r"[a-z0-9]+")
+
+
+def build_prompt(prompt):
+    return f"You are a crypto expert. Answer concise: {prompt}"
+
+
+def estimate_tokens(text):
+    # ~4 characters per token is close enough for budgeting English text.
+    return len(text) // 4 + 1
+
+
+def _gist(turn):
+    """One-line digest of a turn: its first sentence, capped in length."""
+    text = " ".join(turn["content"].split())
+    first = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0][:GIST_CHARS]
+    speaker = "User" if turn["role"] == "user" else "Assistant"
+    return f"{speaker}: {first}"
+
+
+def _keep_tail(text, budget):
+    """Trim `text` from the front (at a word boundary) to fit `budget` tokens."""
+    while text and estimate_tokens(text) > budget:
+        cut = text.find(" ", len(text) - budget * 4)
+        text = text[cut + 1:] if cut != -1 else ""
+    return text
+
+
+class Conversation:
+    """Per-session chat history with bounded memory and bounded model context.
+
+    Turns live in a ring buffer; turns that fall out of it are folded into a
+    short running summary. The model context is that summary plus as many
+    recent turns as fit the token budget. The dialog renders only the last
+    `visible` messages and pages further back on request.
+    """
+
+    def __init__(self, max_turns=CHAT_MAX_TURNS, token_budget=CHAT_TOKEN_BUDGET,
+                 summary_budget=CHAT_SUMMARY_BUDGET, page_size=CHAT_PAGE_SIZE):
+        self.turns = deque(maxlen=max_turns)
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.page_size = page_size
+        self.visible = page_size
+        self.summary = ""
+
+    def append(self, role, content):
+        if len(self.turns) == self.turns.maxlen:
+            self.summary = self._summarize(self.summary, [self.turns[0]])
+        self.turns.append({"role": role, "content": content})
+
+    def _summarize(self, summary, turns):
+        text = " ".join([summary] + [_gist(turn) for turn in turns]).strip()
+        return _keep_tail(text, self.summary_budget)
+
+    @property
+    def has_history(self):
+        return bool(self.turns or self.summary)
+
+    def model_prompt(self, prompt):
+        """Full model input for `prompt`, fitted to the token budget."""
+        header = "You are a crypto expert. Answer concise, using the conversation so far."
+        question = f"Question: {prompt}"
+        budget = self.token_budget - estimate_tokens(header) - estimate_tokens(question) - self.summary_budget
+        recent = []
+        for turn in reversed(self.turns):
+            line = f"{'User' if turn['role'] == 'user' else 'Assistant'}: {turn['content']}"
+            cost = estimate_tokens(line)
+            if cost > budget:
+                break
+            recent.append(line)
+            budget -= cost
+        recent.reverse()
+        older = list(self.turns)[:len(self.turns) - len(recent)]
+        summary = self._summarize(self.summary, older) if older else self.summary
+        parts = [header]
+        if summary:
+            parts.append(f"Summary of earlier conversation: {summary}")
+        if recent:
+            parts.append("Recent conversation:\n" + "\n".join(recent))
+        parts.append(question)
+        return "\n\n".join(parts)
+
+    def window(self):
+        """Messages to render: the most recent `visible` turns."""
+        turns = list(self.turns)
+        return turns[-self.visible:]
+
+    def hidden_count(self):
+        return max(0, len(self.turns) - self.visible)
+
+    def show_older(self):
+        self.visible += self.page_size
+
+    def reset_window(self):
+        self.visible = self.page_size
+
+
+def normalize_prompt(prompt):
+    """Case-, punctuation- and whitespace-insensitive cache key."""
+    return " ".join(_WORDS.findall(prompt.lower()))
+
+
+def content_words(prompt):
+    return frozenset(normalize_prompt(prompt).split()) - STOP_WORDS
+
+
+def is_follow_up(prompt):
+    """True if `prompt` may only make sense after the earlier turns."""
+    words = normalize_prompt(prompt).split()
+    return (len(words) < FOLLOW_UP_MIN_WORDS or not FOLLOW_UP_WORDS.isdisjoint(words)
+            or words[0] in FOLLOW_UP_OPENERS or " ".join(words[:2]) in FOLLOW_UP_OPENERS)
+
+
+def embed(text, dim=EMBEDDING_DIM):
+    """Hashed bag of words and word bigrams, L2-normalized.
+
+    Computed locally; it only has to tell rephrasings of the same short
+    question apart from different questions.
+    """
+    words = normalize_prompt(text).split()
+    vec = np.zeros(dim)
+    for token in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        vec[zlib.crc32(token.encode("utf-8")) % dim] += 1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+class SemanticIndex:
+    """Embeddings of cached prompts, searched with one matrix-vector product."""
+
+    def __init__(self, embed=embed, threshold=SEMANTIC_THRESHOLD, capacity=1024):
+        self.embed = embed
+        self.threshold = threshold
+        self.capacity = capacity
+        self._keys = []
+        self._vectors = None
+        self._lock = threading.Lock()
+
+    def add(self, key, text):
+        vec = self.embed(text)
+        with self._lock:
+            if key in self._keys:
+                return
+            if self._vectors is None:
+                self._vectors = np.empty((self.capacity, len(vec)))
+            if len(self._keys) == self.capacity:
+                # Drop the oldest half; the response cache evicts LRU anyway.
+                keep = self.capacity // 2
+                self._vectors[:keep] = self._vectors[self.capacity - keep:]
+                self._keys = self._keys[self.capacity - keep:]
+            self._vectors[len(self._keys)] = vec
+            self._keys.append(key)
+
+    def nearest(self, text):
+        """Key of the most similar stored prompt above the threshold, or None."""
+        with self._lock:
+            if not self._keys:
+                return None
+            scores = self._vectors[:len(self._keys)] @ self.embed(text)
+            best = int(np.argmax(scores))
+            return self._keys[best] if scores[best] >= self.threshold else None
+
+
+_gemini_api_key = None
+
+
+def configure_gemini(api_key):
+    """Remember the API key; the client is configured when first needed."""
+    global _gemini_api_key
+    _gemini_api_key = api_key
+
+
+def _gemini_model(name):
+    # Imported here: the Gemini SDK is slow to import and only the chat needs it.
+    import google.generativeai as genai
+    genai.configure(api_key=_gemini_api_key)
+    return genai.GenerativeModel(name)
+
+
+class ChatResponder:
+    """Streams answers, serving repeats from a TTL/LRU response cache.
+
+    `model_factory(name)` must return an object whose
+    `generate_content(prompt, stream=True)` yields chunks with a `.text`;
+    pass a fake one to run without the Gemini client. Upstream calls go
+    through the shared AIGateway, so identical prompts in flight at the same
+    time cost one call. A `shared` cache lets answers cached by one worker
+    serve exact repeats on the others. With `semantic`, a rephrasing that
+    only differs in stop words and word order also counts as a repeat.
+    """
+
+    def __init__(self, model_name=CHAT_MODEL, model_factory=_gemini_model, ttl=CHAT_CACHE_TTL,
+                 max_bytes=CHAT_CACHE_MAX_BYTES, semantic=False, gateway=ai_gateway, shared=None):
+        self.model_name = model_name
+        self.model_factory = model_factory
+        self.gateway = gateway
+        self.cache = TTLCache(ttl=ttl, max_bytes=max_bytes)
+        self.shared = shared
+        self.index = SemanticIndex() if semantic else None
+        self._model = None
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.semantic_hits = 0
+
+    def model(self):
+        with self._lock:
+            if self._model is None:
+                self._model = self.model_factory(self.model_name)
+            return self._model
+
+    def cached(self, prompt):
+        key = normalize_prompt(prompt)
+        response = self.cache.get(key)
+        if response is None and self.shared is not None:
+            response = self.shared.get(key)
+            if response is not None:
+                self.cache.put(key, response)
+        if response is None and self.index is not None:
+            similar = self.index.nearest(prompt)
+            # Similar wording is not enough: "... for Bitcoin" and "... for
+            # Ethereum" embed close together but are different questions.
+            if similar is not None and similar != key and content_words(similar) == content_words(key):
+                response = self.cache.get(similar)
+                if response is not None:
+                    self.semantic_hits += 1
+        return response
+
+    def stream(self, prompt, model_prompt=None):
+        """Yield response text chunks; a cache hit arrives as a single chunk.
+
+        `model_prompt` carries conversation context. It is only used for
+        follow-ups (see `is_follow_up`), whose answers depend on earlier turns
+        and are neither cached nor served from the cache. A standalone
+        question is answered on its own, so every session shares its answer.
+        """
+        if model_prompt is not None and not is_follow_up(prompt):
+            model_prompt = None
+        response = self.cached(prompt) if model_prompt is None else None
+        if response is not None:
+            yield response
+            return
+        self.llm_calls += 1
+        model_input = model_prompt or build_prompt(prompt)
+        model = self.model()
+
+        def open_stream():
+            for chunk in model.generate_content(model_input, stream=True):
+                if chunk.text:
+                    yield chunk.text
+
+        full_response = ""
+        for text in self.gateway.stream(model_input, open_stream):
+            full_response += text
+            yield text
+        if full_response and model_prompt is None:
+            key = normalize_prompt(prompt)
+            self.cache.put(key, full_response)
+            if self.shared is not None:
+                self.shared.put(key, full_response)
+            if self.index is not None:
+                self.index.add(key, prompt)
+
+    def stats(self):
+        return {**self.cache.stats(), "llm_calls": self.llm_calls, "semantic_hits": self.semantic_hits,
+                "gateway": self.gateway.stats()}
+
+
+chat_responder = ChatResponder(shared=SharedCache("chat", ttl=CHAT_CACHE_TTL))
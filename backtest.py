@@ -0,0 +1,241 @@
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from cache import TTLCache
+from indicators import rsi_matrix
+from metrics import metrics
+
+# Backtests of the dashboard's own rules: the RSI badge (buy below 30, sell
+# above 70) and the SMA trend line (long while price is above it). A rule
+# yields a 0/1 position per bar, decided at that bar's close and held over
+# the next bar. Every parameter combination is one column of a
+# (time x combination) matrix, so a whole grid is simulated in one pass of
+# array operations with no per-bar Python loop.
+
+FEE_BPS = 10.0           # per side, charged on every change of position
+RSI_BUY = 30
+RSI_SELL = 70
+SMA_WINDOW = 20
+PERIODS_PER_YEAR = {"1m": 365 * 1440, "5m": 365 * 288, "15m": 365 * 96, "1h": 365 * 24, "1d": 365}
+
+SWEEP_RSI_WINDOWS = (7, 14, 21)
+SWEEP_RSI_BUY = tuple(range(10, 46))
+SWEEP_RSI_SELL = tuple(range(55, 91))
+SWEEP_SMA_WINDOWS = tuple(range(5, 201))
+SWEEP_WORKERS = 6        # one per pair
+SWEEP_TTL = 10 * 60
+
+STAT_COLUMNS = ["total_return", "max_drawdown", "sharpe", "trades", "exposure"]
+
+
+# --- POSITIONS ---
+def hold_positions(enter, exit):
+    """1 from each `enter` bar until the next `exit` bar, else 0.
+
+    Works column-wise on (time x combination) boolean arrays: the state at
+    every bar is the last event seen so far, found with a running maximum
+    over event row numbers.
+    """
+    event = np.where(enter, 1.0, np.where(exit, 0.0, np.nan))
+    rows = np.arange(len(event)).reshape((-1,) + (1,) * (event.ndim - 1))
+    last = np.maximum.accumulate(np.where(np.isnan(event), 0, rows), axis=0)
+    held = np.take_along_axis(event, last, axis=0)
+    return np.nan_to_num(held, nan=0.0)
+
+
+def rsi_positions(close, window=14, buy=RSI_BUY, sell=RSI_SELL):
+    """Long after RSI dips under `buy`, flat after it rises over `sell`.
+
+    `buy`/`sell` may be arrays of equal length; each pair is one column.
+    """
+    rsi = rsi_matrix(np.asarray(close, dtype=float)[:, None], window)
+    buy = np.atleast_1d(np.asarray(buy, dtype=float))
+    sell = np.atleast_1d(np.asarray(sell, dtype=float))
+    # NaN RSI (warm-up) compares False, so it never triggers.
+    return hold_positions(rsi < buy, rsi > sell)
+
+
+def sma_windows(close, windows):
+    """(time x window) simple moving averages from one cumulative sum."""
+    close = np.asarray(close, dtype=float)
+    windows = np.atleast_1d(np.asarray(windows, dtype=np.int64))
+    csum = np.concatenate(([0.0], np.cumsum(close)))
+    rows = np.arange(1, len(close) + 1)[:, None]
+    start = rows - windows[None, :]
+    out = (csum[rows] - csum[np.maximum(start, 0)]) / windows
+    out[start < 0] = np.nan
+    return out
+
+
+def sma_positions(close, windows=SMA_WINDOW):
+    close = np.asarray(close, dtype=float)
+    return (close[:, None] > sma_windows(close, windows)).astype(float)
+
+
+# --- SIMULATION ---
+def simulate(close, positions, fee=FEE_BPS / 1e4, periods_per_year=365):
+    """Equity, drawdown and stats for every column of `positions`.
+
+    Returns a dict of (time x combination) arrays (`held`, `returns`,
+    `equity`, `drawdown`) and `stats`, a dict of per-combination arrays.
+    """
+    close = np.asarray(close, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    if positions.ndim == 1:
+        positions = positions[:, None]
+    bar_returns = np.zeros(len(close))
+    bar_returns[1:] = close[1:] / close[:-1] - 1
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+    turnover = np.abs(np.diff(positions, axis=0, prepend=0.0))
+    returns = held * bar_returns[:, None] - fee * turnover
+    equity = np.cumprod(1.0 + returns, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1.0
+
+    std = returns.std(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, returns.mean(axis=0) / std * np.sqrt(periods_per_year), 0.0)
+    stats = {
+        "total_return": equity[-1] - 1.0,
+        "max_drawdown": drawdown.min(axis=0),
+        "sharpe": sharpe,
+        "trades": (np.diff(positions, axis=0, prepend=0.0) > 0).sum(axis=0),
+        "exposure": held.mean(axis=0),
+    }
+    return {"held": held, "returns": returns, "equity": equity, "drawdown": drawdown, "stats": stats}
+
+
+def run_rule(close, rule, fee=FEE_BPS / 1e4, periods_per_year=365, **params):
+    """Backtest one rule on a close Series.
+
+    `rule` is "rsi" (params: window, buy, sell) or "sma" (params: window).
+    Returns a frame indexed like `close` (Close, Position, Equity, BuyHold,
+    Drawdown) and a dict of scalar stats, including buy-and-hold's return.
+    """
+    values = close.to_numpy(dtype=float)
+    if rule == "rsi":
+        positions = rsi_positions(values, params.get("window", 14), params.get("buy", RSI_BUY),
+                                  params.get("sell", RSI_SELL))
+    elif rule == "sma":
+        positions = sma_positions(values, params.get("window", SMA_WINDOW))
+    else:
+        raise ValueError(f"unknown rule: {rule!r}")
+    result = simulate(values, positions, fee, periods_per_year)
+    frame = pd.DataFrame({
+        "Close": values,
+        "Position": positions[:, 0],
+        "Equity": result["equity"][:, 0],
+        "BuyHold": values / values[0],
+        "Drawdown": result["drawdown"][:, 0],
+    }, index=close.index)
+    stats = {name: float(value[0]) for name, value in result["stats"].items()}
+    stats["buy_hold_return"] = float(values[-1] / values[0] - 1.0)
+    return frame, stats
+
+
+# --- PARAMETER SWEEPS ---
+def sweep_symbol(close, rsi_windows=SWEEP_RSI_WINDOWS, buys=SWEEP_RSI_BUY, sells=SWEEP_RSI_SELL,
+                 sma_lengths=SWEEP_SMA_WINDOWS, fee=FEE_BPS / 1e4, periods_per_year=365):
+    """Stats for every rule/parameter combination on one close series."""
+    close = np.asarray(close, dtype=float)
+    close = close[~np.isnan(close)]
+    buy, sell = (grid.ravel() for grid in np.meshgrid(np.asarray(buys, dtype=float),
+                                                      np.asarray(sells, dtype=float), indexing="ij"))
+    keep = buy < sell
+    buy, sell = buy[keep], sell[keep]
+    frames = []
+    for window in rsi_windows:
+        stats = simulate(close, rsi_positions(close, window, buy, sell), fee, periods_per_year)["stats"]
+        frames.append(pd.DataFrame({"rule": "rsi", "window": window, "buy": buy, "sell": sell, **stats}))
+    windows = np.asarray(sma_lengths, dtype=np.int64)
+    windows = windows[windows < len(close)]
+    stats = simulate(close, sma_positions(close, windows), fee, periods_per_year)["stats"]
+    frames.append(pd.DataFrame({"rule": "sma", "window": windows, "buy": np.nan, "sell": np.nan, **stats}))
+    return pd.concat(frames, ignore_index=True)
+
+
+_pool = None
+_pool_lock = threading.RLock()
+
+
+@contextmanager
+def _bare_main():
+    """Hide the entry script from workers spawned inside the block.
+
+    A spawned child re-runs its parent's `__main__` file before taking work.
+    Under Streamlit that is app.py, so every worker would render the whole
+    app (and die at `st.secrets` without a secrets file). A stand-in module
+    with no file leaves the child nothing to re-run; `sweep_symbol` is
+    pickled by reference to this module and imported as usual.
+    """
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+def sweep_pool():
+    """Process pool shared by all sessions, started on the first sweep.
+
+    Workers are spawned rather than forked: the Streamlit server is
+    multi-threaded, and forking it could copy a lock held by another thread.
+    They are all started here, so later submits never spawn.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = min(SWEEP_WORKERS, os.cpu_count() or 1)
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            with _bare_main():
+                # Processes start on submit; one task each before any is idle.
+                for future in [pool.submit(os.getpid) for _ in range(workers)]:
+                    future.result()
+            _pool = pool
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _sweep(closes, fee, periods_per_year):
+    pool = sweep_pool()
+    futures = {symbol: pool.submit(sweep_symbol, closes[symbol].to_numpy(), fee=fee,
+                                   periods_per_year=periods_per_year)
+               for symbol in closes.columns}
+    try:
+        frames = [future.result().assign(symbol=symbol) for symbol, future in futures.items()]
+    except BrokenProcessPool:
+        # A broken pool refuses all further work; start a fresh one next time.
+        _discard_pool(pool)
+        raise
+    results = pd.concat(frames, ignore_index=True)
+    return results.sort_values("total_return", ascending=False, ignore_index=True)
+
+
+sweep_cache = TTLCache(ttl=SWEEP_TTL, max_bytes=64 * 1024 * 1024)
+
+
+def sweep(closes, fee=FEE_BPS / 1e4, periods_per_year=365):
+    """Default parameter grid over every column of a (time x symbol) close
+    matrix, one pool task per symbol, best total return first. Results are
+    shared until the matrix gains or changes a bar."""
+    last = tuple(closes.iloc[-1].fillna(0.0))  # NaN would never compare equal
+    key = (tuple(closes.columns), len(closes), closes.index[-1], last, fee, periods_per_year)
+    with metrics.span("backtest_sweep"):
+        return sweep_cache.get_or_fetch(key, lambda: _sweep(closes, fee, periods_per_year))
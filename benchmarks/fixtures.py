@@ -0,0 +1,294 @@
+"""Recorded Yahoo, RSS and Gemini responses, and an offline mode that serves them.
+
+    python benchmarks/fixtures.py --record
+
+re-records benchmarks/data/ from the live services (Gemini only when
+GEMINI_API_KEY is set). Benchmarks wrap their work in `offline()`, which
+patches the three network edges of the app: `yfinance.download` /
+`yfinance.Ticker`, the news service's HTTP session and the chat model
+factory. Everything between those edges runs unmodified. Mail needs no
+patching: `FixtureSMTPServer` is a local SMTP server the contact form can
+be pointed at through the `[email]` secrets.
+"""
+import argparse
+import contextlib
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+sys.path.insert(0, ROOT)
+
+OHLC_FILE = "ohlc_1d.csv"
+FEED_FILES = {"Cointelegraph": "cointelegraph.xml", "CoinDesk": "coindesk.xml", "Decrypt": "decrypt.xml"}
+GEMINI_FILE = "gemini_chat.json"
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _path(name):
+    return os.path.join(DATA_DIR, name)
+
+
+def read_bytes(name):
+    with open(_path(name), "rb") as f:
+        return f.read()
+
+
+# --- YAHOO ---
+def load_ohlc():
+    """Recorded daily bars as {symbol: frame}, shifted so the last bar is today."""
+    import pandas as pd
+    raw = pd.read_csv(_path(OHLC_FILE), parse_dates=["Date"])
+    shift = pd.Timestamp.now().normalize() - raw["Date"].max()
+    raw["Date"] += shift
+    return {symbol: group.set_index("Date")[FIELDS] for symbol, group in raw.groupby("Symbol")}
+
+
+class FixtureYahoo:
+    """Stand-ins for `yf.download` and `yf.Ticker` over the recorded bars.
+
+    Only daily bars are recorded; intraday requests get an empty frame,
+    which the app treats like Yahoo having no data for that window.
+    """
+
+    def __init__(self, frames=None):
+        self.frames = frames if frames is not None else load_ohlc()
+        self.calls = 0
+
+    def _window(self, symbol, interval, start=None):
+        import pandas as pd
+        df = self.frames.get(symbol)
+        if df is None or interval != "1d":
+            return pd.DataFrame(columns=FIELDS, index=pd.DatetimeIndex([], name="Date"))
+        return df.loc[df.index >= pd.Timestamp(start)] if start is not None else df
+
+    def download(self, tickers, period=None, start=None, interval="1d", **_):
+        import pandas as pd
+        self.calls += 1
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {symbol: self._window(symbol, interval, start) for symbol in symbols}
+        frames = {symbol: df for symbol, df in frames.items() if not df.empty}
+        if not frames:
+            return pd.DataFrame(columns=pd.MultiIndex.from_product([[], FIELDS]))
+        return pd.concat(frames, axis=1)
+
+    def ticker(self, symbol):
+        def history(period=None, interval="1d", start=None, **_):
+            self.calls += 1
+            df = self._window(symbol, interval, start).copy()
+            if not df.empty:
+                df.index = df.index.tz_localize("UTC")
+            return df
+        return SimpleNamespace(history=history)
+
+
+# --- RSS ---
+class FixtureResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FixtureSession:
+    """Serves the recorded feed for each of NEWS_SOURCES' URLs."""
+
+    def __init__(self):
+        from news import NEWS_SOURCES
+        self.feeds = {source.url: read_bytes(FEED_FILES[source.name]) for source in NEWS_SOURCES}
+        self.requests = 0
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.requests += 1
+        return FixtureResponse(self.feeds[url])
+
+
+# --- GEMINI ---
+def load_gemini():
+    with open(_path(GEMINI_FILE), encoding="utf-8") as f:
+        return json.load(f)["responses"]
+
+
+class FixtureModel:
+    """Replays recorded answers; a prompt containing a recorded question gets
+    its answer, anything else the first one."""
+
+    def __init__(self, responses=None):
+        self.responses = responses if responses is not None else load_gemini()
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=True):
+        self.calls += 1
+        match = next((r for r in self.responses if r["prompt"] in prompt), self.responses[0])
+        for text in match["chunks"]:
+            yield SimpleNamespace(text=text)
+
+
+def fixture_responder(model=None, gateway=None):
+    """A ChatResponder on the recorded model, behind an unthrottled gateway."""
+    from ai_gateway import AIGateway
+    from assistant import ChatResponder
+    model = model or FixtureModel()
+    return ChatResponder(model_factory=lambda name: model,
+                         gateway=gateway or AIGateway(rate=1e9, burst=1e9))
+
+
+# --- SMTP ---
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib.sendmail without STARTTLS or AUTH."""
+
+    def reply(self, text):
+        self.wfile.write(text.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.reply("220 fixture ESMTP")
+        for line in self.rfile:
+            verb = line.split(b" ", 1)[0].strip().upper()
+            if verb == b"DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                for data in self.rfile:
+                    if data == b".\r\n":
+                        break
+                self.server.received()
+                self.reply("250 OK")
+            elif verb == b"QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class FixtureSMTPServer(socketserver.ThreadingTCPServer):
+    """Local SMTP server on a free port that accepts and counts messages."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1"):
+        super().__init__((host, 0), _SMTPHandler)
+        self.messages = 0
+        self._lock = threading.Lock()
+
+    def received(self):
+        with self._lock:
+            self.messages += 1
+
+    def secrets(self):
+        """An `[email]` secrets section that sends through this server."""
+        host, port = self.server_address
+        return {"sender_email": "academy@example.com", "sender_password": "", "receiver_email": "team@example.com",
+                "smtp_host": host, "smtp_port": port, "smtp_starttls": False}
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, name="fixture-smtp", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+@contextlib.contextmanager
+def offline():
+    """Serve every upstream call from the recordings while the block runs.
+
+    The OHLC store and the quiz attempt log go to temporary files, so the
+    benchmark neither reads nor grows the app's on-disk state. Their paths
+    are restored on exit, so a later offline() gets fresh files instead of
+    the ones this block deletes.
+    """
+    tmp = tempfile.TemporaryDirectory()
+    paths = {"OHLC_DB_PATH": "ohlc.sqlite3", "QUIZ_DB_PATH": "quiz.sqlite3"}
+    saved_env = {name: os.environ.get(name) for name in paths}
+    for name, filename in paths.items():
+        os.environ[name] = os.path.join(tmp.name, filename)
+    import yfinance as yf
+
+    import assistant
+    import news
+
+    yahoo = FixtureYahoo()
+    saved = (yf.download, yf.Ticker, news.news_service, assistant.chat_responder)
+    yf.download, yf.Ticker = yahoo.download, yahoo.ticker
+    news.news_service = news.NewsService(session=FixtureSession())
+    news.news_service.poll()
+    assistant.chat_responder = fixture_responder()
+    try:
+        yield yahoo
+    finally:
+        news.news_service.stop()
+        yf.download, yf.Ticker, news.news_service, assistant.chat_responder = saved
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        tmp.cleanup()
+
+
+# --- RECORDING ---
+def record():
+    import requests
+    import yfinance as yf
+
+    from market_data import ASSET_PAIRS, PREFETCH_PERIOD
+    from news import NEWS_SOURCES
+
+    raw = yf.download(list(ASSET_PAIRS.values()), period=PREFETCH_PERIOD, interval="1d",
+                      group_by="ticker", auto_adjust=True, threads=True, progress=False)
+    long = raw.stack(level=0, future_stack=True).rename_axis(["Date", "Symbol"]).reset_index()
+    long = long.dropna(subset=["Close"]).sort_values(["Symbol", "Date"])
+    long["Date"] = long["Date"].dt.strftime("%Y-%m-%d")
+    long[["Symbol", "Date"] + FIELDS].to_csv(_path(OHLC_FILE), index=False)
+    print(f"{OHLC_FILE}: {len(long)} bars")
+
+    for source in NEWS_SOURCES:
+        response = requests.get(source.url, timeout=source.timeout)
+        response.raise_for_status()
+        with open(_path(FEED_FILES[source.name]), "wb") as f:
+            f.write(response.content)
+        print(f"{FEED_FILES[source.name]}: {len(response.content)} bytes")
+
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        print(f"{GEMINI_FILE}: skipped (GEMINI_API_KEY not set)")
+        return
+    from assistant import CHAT_MODEL, _gemini_model, build_prompt, configure_gemini
+    configure_gemini(api_key)
+    model = _gemini_model(CHAT_MODEL)
+    responses = [{"prompt": r["prompt"],
+                  "chunks": [c.text for c in model.generate_content(build_prompt(r["prompt"]), stream=True) if c.text]}
+                 for r in load_gemini()]
+    with open(_path(GEMINI_FILE), "w", encoding="utf-8") as f:
+        json.dump({"model": CHAT_MODEL, "responses": responses}, f, indent=2)
+        f.write("\n")
+    print(f"{GEMINI_FILE}: {len(responses)} answers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--record", action="store_true", help="re-record benchmarks/data/ from the live services")
+    args = parser.parse_args()
+    if args.record:
+        record()
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Timings for the data and render hot paths, saved as JSON per commit.
+
+Run from the repository root:
+
+    python benchmarks/hot_paths.py [-k rsi] [--rounds 7] [--compare OLD.json]
+
+No network is used: market data, feeds and chat answers come from the
+recordings in benchmarks/data/ (see fixtures.py). Results are written to
+benchmarks/results/<commit>.json; `--compare` prints the change in median
+time against an earlier results file and exits non-zero when any benchmark
+slowed down by more than `--threshold`. A benchmark that raises is recorded
+with its error, the rest still run and are saved, and the exit status is
+non-zero.
+
+Benchmarks:
+  rsi/<n>          calculate_rsi over an n-row close series (1k to 1M)
+  news/parse/<src> streaming parse of one recorded feed
+  news/poll        one NewsService poll: fetch, parse and merge all feeds
+  figure/<type>    build_market_figure for a year of daily bars
+  chat/<path>      ChatResponder.stream, uncached and cached
+  backtest/<case>  one pair's full parameter sweep; all six pairs in the pool
+  app/<page>       a full headless script run of one page via AppTest
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from fixtures import FEED_FILES, ROOT, FixtureModel, FixtureSession, fixture_responder, offline, read_bytes
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+RSI_SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+APP_PAGES = ["views/cover.py", "views/news_feed.py", "views/market.py", "views/compare.py", "views/learn.py",
+             "views/quiz.py"]
+REPORTED_PACKAGES = ["numpy", "pandas", "plotly", "streamlit", "yfinance"]
+
+
+def time_rounds(func, rounds, warmup=1):
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings):
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+# --- CASES ---
+# Each yields (name, func, rounds); setup runs outside the timed region.
+def rsi_cases(rounds):
+    import numpy as np
+    import pandas as pd
+
+    from indicators import calculate_rsi
+    rng = np.random.default_rng(19)
+    for label, n in RSI_SIZES.items():
+        df = pd.DataFrame({"Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))})
+        yield f"rsi/{label}", lambda df=df: calculate_rsi(df), max(3, rounds if n < 1_000_000 else rounds // 2)
+
+
+def news_cases(rounds):
+    from news import NEWS_CHUNK_SIZE, NewsService, parse_feed_stream
+    for name, filename in FEED_FILES.items():
+        content = read_bytes(filename)
+        chunks = [content[i:i + NEWS_CHUNK_SIZE] for i in range(0, len(content), NEWS_CHUNK_SIZE)]
+        yield f"news/parse/{name}", lambda name=name, chunks=chunks: parse_feed_stream(chunks, name), rounds * 5
+
+    session = FixtureSession()
+
+    def poll():
+        service = NewsService(session=session)
+        service.poll()
+        service._executor.shutdown()
+    yield "news/poll", poll, rounds
+
+
+def figure_cases(rounds):
+    from charts import build_market_figure
+    from indicators import calculate_rsi, calculate_sma
+    from market_data import get_history
+    df = get_history("BTC-USD", "1y")
+    df["SMA_20"] = calculate_sma(df)
+    df["RSI"] = calculate_rsi(df)
+    for chart_type in ("Candlestick", "Line"):
+        yield f"figure/{chart_type.lower()}", lambda chart_type=chart_type: build_market_figure(df, chart_type), rounds
+
+
+def chat_cases(rounds):
+    model = FixtureModel()
+    prompt = model.responses[0]["prompt"]
+    warm = fixture_responder(model)
+    assert list(warm.stream(prompt)), "recorded answer is empty"
+
+    def miss():
+        # A fresh responder has an empty cache but shares the warm gateway.
+        for _ in fixture_responder(model, warm.gateway).stream(prompt):
+            pass
+
+    def hit():
+        for _ in warm.stream(prompt):
+            pass
+    yield "chat/uncached", miss, rounds
+    yield "chat/cached", hit, rounds * 5
+
+
+def backtest_cases(rounds):
+    from backtest import _sweep, sweep_pool, sweep_symbol
+    from market_data import close_matrix
+    closes = close_matrix()
+    close = closes["BTC-USD"].to_numpy()
+    yield "backtest/sweep_symbol", lambda: sweep_symbol(close), rounds
+    sweep_pool()  # spawn the workers outside the timed region
+    yield "backtest/sweep_all", lambda: _sweep(closes, fee=0.001, periods_per_year=365), max(3, rounds // 2)
+
+
+def app_cases(rounds):
+    from streamlit.testing.v1 import AppTest
+    app_path = os.path.join(ROOT, "app.py")
+
+    def run_page(page):
+        at = AppTest.from_file(app_path, default_timeout=60)
+        # app.py reads st.secrets before any page runs; without a secrets
+        # file that raises, so give it the same stand-in config as load_test.
+        at.secrets["gemini"] = {"api_key": "fixture"}
+        if page != APP_PAGES[0]:
+            at.switch_page(page)
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].message}")
+    for page in APP_PAGES:
+        name = os.path.splitext(os.path.basename(page))[0]
+        yield f"app/{name}", lambda page=page: run_page(page), max(3, rounds // 2)
+
+
+CASES = [rsi_cases, news_cases, figure_cases, chat_cases, backtest_cases, app_cases]
+
+
+# --- RESULTS ---
+def git_commit():
+    def git(*args):
+        proc = subprocess.run(["git", *args], capture_output=True, text=True, cwd=ROOT)
+        return proc.stdout.strip() if proc.returncode == 0 else ""
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    return commit, dirty
+
+
+def package_versions():
+    from importlib.metadata import PackageNotFoundError, version
+    versions = {}
+    for name in REPORTED_PACKAGES:
+        try:
+            versions[name] = version(name)
+        except PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def compare(old, new, threshold):
+    """Print median changes; return the names that regressed past `threshold`
+    or failed in the new run."""
+    regressed = []
+    print(f"\n{'benchmark':<28}{'old ms':>12}{'new ms':>12}{'change':>10}")
+    for name, result in new["benchmarks"].items():
+        before = old["benchmarks"].get(name)
+        if "error" in result:
+            print(f"{name:<28}{'-':>12}{'failed':>12}")
+            regressed.append(name)
+            continue
+        if before is None or "error" in before:
+            print(f"{name:<28}{'-':>12}{result['median'] * 1000:12.3f}{'new':>10}")
+            continue
+        change = result["median"] / before["median"] - 1
+        flag = "  <-- slower" if change > threshold else ""
+        print(f"{name:<28}{before['median'] * 1000:12.3f}{result['median'] * 1000:12.3f}{change:+10.1%}{flag}")
+        if flag:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=7, help="timed rounds per benchmark (scaled per case)")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="OLD", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="median slowdown treated as a regression")
+    args = parser.parse_args()
+
+    commit, dirty = git_commit()
+    results = {}
+    with offline():
+        for case in CASES:
+            for name, func, rounds in case(args.rounds):
+                if args.pattern and args.pattern not in name:
+                    continue
+                try:
+                    results[name] = summarize(time_rounds(func, rounds))
+                except Exception as e:
+                    # Keep going: one broken case must not discard the others.
+                    results[name] = {"error": repr(e)}
+                    print(f"{name:<28}{'failed':>12}     {e!r}")
+                    continue
+                r = results[name]
+                print(f"{name:<28}{r['median'] * 1000:12.3f} ms median  "
+                      f"(min {r['min'] * 1000:.3f}, {r['rounds']} rounds)")
+
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": package_versions(),
+        "benchmarks": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"\nsaved {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressed = compare(json.load(f), report, args.threshold)
+        if regressed:
+            sys.exit(f"regressed: {', '.join(regressed)}")
+    failed = [name for name, result in results.items() if "error" in result]
+    if failed:
+        sys.exit(f"failed: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
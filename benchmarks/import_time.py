@@ -0,0 +1,105 @@
+"""Import cost and cover-page time-to-first-render.
+
+Run from the repository root:
+
+    python benchmarks/import_time.py [--baseline REV]
+
+1. `python -X importtime` in a fresh interpreter for two import sets: every
+   module app.py used to import eagerly, and what the cover page needs now.
+2. A cold headless render of the cover page with Streamlit's AppTest, in a
+   fresh interpreter, for the current tree and optionally for the tree at
+   git revision REV (e.g. the commit before lazy imports). Also lists which
+   heavy subsystem modules ended up loaded. A render that raises stops the
+   run rather than being reported as a time.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_IMPORTS = [
+    "streamlit", "pandas", "numpy", "yfinance", "time", "smtplib", "requests",
+    "xml.etree.ElementTree", "streamlit.components.v1", "google.generativeai",
+    "plotly.graph_objects", "plotly.subplots", "email.mime.text",
+    "email.mime.multipart", "datetime",
+]
+COVER_IMPORTS = ["streamlit", "static_content"]
+HEAVY_MODULES = ["yfinance", "google.generativeai", "plotly", "smtplib", "email.mime", "xml.etree", "pandas"]
+
+RENDER_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+# Both trees read st.secrets on the first run; without a secrets file that
+# raises, so give them the same stand-in config as hot_paths.app_cases.
+at.secrets["gemini"] = {"api_key": "fixture"}
+at.run()
+elapsed = time.perf_counter() - start
+loaded = [m for m in json.loads(sys.argv[2]) if m in sys.modules]
+print(json.dumps({"seconds": elapsed, "exceptions": [e.message for e in at.exception], "loaded": loaded}))
+"""
+
+
+def importtime(modules):
+    """Total and per-module cumulative import time (ms) in a fresh interpreter."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, cwd=ROOT)
+    top = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        # Top-level entries are the ones not indented under another import.
+        if not line.split("|")[2].startswith("  "):
+            top[name] = int(cumulative) / 1000
+    return sum(top.values()), top
+
+
+def render(app_path):
+    proc = subprocess.run([sys.executable, "-c", RENDER_SNIPPET, app_path, json.dumps(HEAVY_MODULES)],
+                          capture_output=True, text=True, cwd=os.path.dirname(app_path))
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "render failed")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if result["exceptions"]:
+        # A crashed run stops early and would time as a fast render.
+        raise RuntimeError(f"{app_path} raised: {result['exceptions'][0]}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", help="git revision whose app.py to render for comparison")
+    args = parser.parse_args()
+
+    for label, modules in (("eager (old app.py)", EAGER_IMPORTS), ("cover page (now)", COVER_IMPORTS)):
+        total, top = importtime(modules)
+        heaviest = ", ".join(f"{n} {ms:.0f}ms" for n, ms in sorted(top.items(), key=lambda kv: -kv[1])[:5])
+        print(f"import {label:>20}: {total:8.1f} ms   [{heaviest}]")
+
+    targets = [("current", os.path.join(ROOT, "app.py"))]
+    tmp = None
+    if args.baseline:
+        # Check out the whole tree at REV so its own local modules are used.
+        tmp = tempfile.TemporaryDirectory()
+        archive = subprocess.run(["git", "archive", args.baseline], capture_output=True, cwd=ROOT, check=True)
+        subprocess.run(["tar", "-x", "-C", tmp.name], input=archive.stdout, check=True)
+        targets.insert(0, (args.baseline, os.path.join(tmp.name, "app.py")))
+    try:
+        for label, path in targets:
+            result = render(path)
+            print(f"cover render {label:>12}: {result['seconds'] * 1000:8.1f} ms   "
+                  f"loaded: {', '.join(result['loaded']) or 'none'}")
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+"""Concurrent academy sessions against one `streamlit run app.py` server.
+
+Run from the repository root:
+
+    python benchmarks/load_test.py [--sessions 1 2 4 8 16] [--switches 3] [--seed 0]
+
+For every concurrency level a fresh server process runs the real app.py
+under `streamlit run`, with Yahoo, the feeds and Gemini served from the
+recordings (see fixtures.py) and mail going to a local SMTP server. Each
+simulated student is one websocket connection speaking Streamlit's
+protocol, as a browser tab does: it enters from the cover, lands on the
+news, switches assets and timeframes in Live Market, submits the quiz,
+sends a chat prompt and the contact form. One untimed flow warms the
+server up, then all sessions start together.
+
+A rerun's latency runs from sending the interaction to the end of the run
+it triggers, so time spent queued behind other sessions' reruns counts.
+For each level it reports reruns per second, latency percentiles per step
+and overall, and the server's memory growth per session, and saves
+everything to benchmarks/results/load-<commit>.json. A level in which any
+flow errors is reported as failed, without numbers, and the run exits
+non-zero.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+from fixtures import ROOT, FixtureSMTPServer, load_gemini, offline
+from hot_paths import RESULTS_DIR, git_commit, package_versions
+
+SESSION_LEVELS = [1, 2, 4, 8, 16]
+ASSET_SWITCHES = 3
+MEMORY_SAMPLE_INTERVAL = 0.05
+SERVER_START_TIMEOUT = 120   # seconds for the server to pass its health check
+RERUN_TIMEOUT = 120          # seconds for one rerun to finish
+MAX_MESSAGE_SIZE = 256 * 2 ** 20
+STEPS = ["cover", "news", "market", "asset", "timeframe", "quiz", "quiz_submit", "chat_open", "chat_send",
+         "contact"]
+
+
+def rss_bytes(pid="self"):
+    """Resident set size of a process (Linux /proc; 0 elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+class MemorySampler:
+    """Peak RSS of `pid` while the block runs, sampled from a background thread."""
+
+    def __init__(self, pid="self", interval=MEMORY_SAMPLE_INTERVAL):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes(self.pid))
+
+    def __enter__(self):
+        self.peak = rss_bytes(self.pid)
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes(self.pid))
+
+
+# --- SERVER ---
+def serve(port, secrets_path, stats_path):
+    """`streamlit run app.py` in this process, offline. On shutdown, writes
+    the upstream call counts to `stats_path`."""
+    with offline() as yahoo:
+        import streamlit as st
+        from streamlit.web import cli
+
+        import assistant
+        import news
+        from mailer import get_mail_queue
+        from quiz_store import attempt_store
+
+        sys.argv = ["streamlit", "run", os.path.join(ROOT, "app.py"), "--server.port", str(port),
+                    "--server.address", "127.0.0.1", "--server.headless", "true",
+                    "--browser.gatherUsageStats", "false", "--secrets.files", secrets_path]
+        try:
+            cli.main()
+        except SystemExit:
+            pass
+        # Mail and quiz attempts are written in the background; let them land.
+        email = st.secrets["email"]
+        get_mail_queue(email["sender_email"], email["sender_password"], email["receiver_email"],
+                       host=email["smtp_host"], port=email["smtp_port"], starttls=email["smtp_starttls"]).join()
+        attempt_store.join()
+        stats = {"yahoo_calls": yahoo.calls, "feed_requests": news.news_service.session.requests,
+                 "gemini_calls": assistant.chat_responder.stats()["llm_calls"],
+                 "quiz_attempts_written": attempt_store.written}
+    with open(stats_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f)
+
+
+def write_secrets(f, secrets):
+    # Flat sections of strings, numbers and booleans; JSON literals are valid TOML.
+    for section, values in secrets.items():
+        f.write(f"[{section}]\n")
+        for key, value in values.items():
+            f.write(f"{key} = {json.dumps(value)}\n")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Server:
+    """A `serve` subprocess on a free port, healthy once the block is entered."""
+
+    def __init__(self, secrets):
+        self.secrets = secrets
+        self.stats = None
+
+    def __enter__(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        secrets_path = os.path.join(self._tmp.name, "secrets.toml")
+        with open(secrets_path, "w", encoding="utf-8") as f:
+            write_secrets(f, self.secrets)
+        self._stats_path = os.path.join(self._tmp.name, "stats.json")
+        self._log = open(os.path.join(self._tmp.name, "server.log"), "w+", encoding="utf-8")
+        self.port = free_port()
+        self.proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(self.port),
+                                      secrets_path, self._stats_path],
+                                     cwd=ROOT, stdout=self._log, stderr=subprocess.STDOUT)
+        try:
+            self._wait_healthy()
+        except Exception:
+            self.__exit__()
+            raise
+        return self
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def _wait_healthy(self):
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"server exited with {self.proc.returncode}: {self.log_tail()}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"server not healthy after {SERVER_START_TIMEOUT}s: {self.log_tail()}")
+
+    def log_tail(self, lines=5):
+        self._log.flush()
+        self._log.seek(0)
+        return " | ".join(self._log.read().strip().splitlines()[-lines:])
+
+    def __exit__(self, *exc):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        if os.path.exists(self._stats_path):
+            with open(self._stats_path, encoding="utf-8") as f:
+                self.stats = json.load(f)
+        self._log.close()
+        self._tmp.cleanup()
+
+
+# --- SESSION FLOW ---
+class Session:
+    """One simulated student on its own websocket. `run` times every rerun
+    of the flow by step.
+
+    Like the browser, it resends the values it has set with every rerun,
+    sends button presses and chat prompts once, and stays on the page the
+    last run finished on.
+    """
+
+    def __init__(self, url, number, seed, switches, prompts, questions):
+        self.url = url
+        self.rng = random.Random(seed * 1_000_003 + number)
+        self.switches = switches
+        self.prompts = prompts
+        self.questions = questions
+        self.page = ""
+        self.pages = {}       # url path -> page script hash
+        self.elements = []    # elements of the last run
+        self.values = {}      # widget id -> WidgetState
+        self.triggers = []
+        self.timings = []
+        self.errors = []
+
+    async def connect(self):
+        # The client Streamlit's own server depends on; `pip install websockets`
+        # with releases that still serve through tornado.
+        import websockets
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=MAX_MESSAGE_SIZE,
+                                           open_timeout=RERUN_TIMEOUT)
+
+    async def close(self):
+        await self.ws.close()
+
+    def widget(self, kind, label=None, key=None):
+        """Latest widget of element type `kind` from the last run, by label or key."""
+        for element in reversed(self.elements):
+            if element.WhichOneof("type") != kind:
+                continue
+            proto = getattr(element, kind)
+            if (label is None or proto.label == label) and (key is None or proto.id.endswith(f"-{key}")):
+                return proto
+        raise LookupError(f"no {kind} keyed {key!r}" if key is not None else f"no {kind} labelled {label!r}")
+
+    def set_value(self, proto, **value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        self.values[proto.id] = WidgetState(id=proto.id, **value)
+
+    def click(self, proto):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        self.triggers.append(WidgetState(id=proto.id, trigger_value=True))
+
+    def chat(self, proto, text):
+        from streamlit.proto.Common_pb2 import ChatInputValue
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        self.triggers.append(WidgetState(id=proto.id, chat_input_value=ChatInputValue(data=text)))
+
+    def switch_page(self, path):
+        self.page = self.pages[os.path.splitext(os.path.basename(path))[0]]
+
+    async def rerun(self, step):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ClientState_pb2 import ClientState
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        # Values of widgets that are gone are dropped, as the browser does.
+        widgets = (getattr(e, e.WhichOneof("type")) for e in self.elements if e.WhichOneof("type"))
+        shown = {w.id for w in widgets if "id" in w.DESCRIPTOR.fields_by_name}
+        state = ClientState(page_script_hash=self.page)
+        state.widget_states.widgets.extend(ws for wid, ws in self.values.items() if wid in shown)
+        state.widget_states.widgets.extend(self.triggers)
+        self.triggers = []
+        start = time.perf_counter()
+        await self.ws.send(BackMsg(rerun_script=state).SerializeToString())
+        while True:
+            msg = ForwardMsg.FromString(await asyncio.wait_for(self.ws.recv(), RERUN_TIMEOUT))
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                # Every run starts with one, including those st.rerun() and
+                # st.switch_page() start on the server.
+                self.page = msg.new_session.page_script_hash
+                self.elements = []
+            elif kind == "navigation":
+                self.pages = {page.url_pathname: page.page_script_hash for page in msg.navigation.app_pages}
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                self.elements.append(msg.delta.new_element)
+            elif kind == "page_not_found":
+                self.errors.append(f"{step}: page not found")
+            elif kind == "script_finished":
+                if msg.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors.append(f"{step}: compile error")
+                break
+        self.timings.append((step, time.perf_counter() - start))
+        self.errors.extend(f"{step}: {e.exception.message}" for e in self.elements
+                           if e.WhichOneof("type") == "exception")
+
+    async def run(self):
+        """Walk the whole flow; a step that cannot continue ends it as an error."""
+        try:
+            await self._flow()
+        except Exception as e:
+            self.errors.append(f"flow stopped after {len(self.timings)} reruns: {e!r}")
+        return self
+
+    async def _flow(self):
+        rng = self.rng
+        await self.rerun("cover")
+        self.click(self.widget("button", "🚀 Enter Academy"))
+        await self.rerun("news")
+        self.switch_page("views/market.py")
+        await self.rerun("market")
+        for _ in range(self.switches):
+            asset = self.widget("selectbox", "Select Asset Pair:")
+            self.set_value(asset, string_value=rng.choice(asset.options))
+            await self.rerun("asset")
+            timeframe = self.widget("selectbox", "Timeframe")
+            self.set_value(timeframe, string_value=rng.choice(timeframe.options))
+            await self.rerun("timeframe")
+        self.switch_page("views/quiz.py")
+        await self.rerun("quiz")
+        for question in self.questions:
+            # Mostly right, so the error-rate aggregates get a realistic spread.
+            options = question["options"]
+            answer = options[question["answer"]] if rng.random() < 0.7 else rng.choice(options)
+            self.set_value(self.widget("radio", key=f"quiz_{question['id']}"), string_value=answer)
+        self.click(self.widget("button", "Submit Answers"))
+        await self.rerun("quiz_submit")
+        # The dialog only renders while its button is pressed, so the
+        # prompt goes in with a second press.
+        self.click(self.widget("button", key="sidebar_agent"))
+        await self.rerun("chat_open")
+        self.click(self.widget("button", key="sidebar_agent"))
+        self.chat(self.widget("chat_input"), rng.choice(self.prompts))
+        await self.rerun("chat_send")
+        self.set_value(self.widget("text_input", "Your Email"),
+                       string_value=f"student{rng.randrange(10_000)}@example.com")
+        self.set_value(self.widget("text_area", "How can we help?"), string_value="Load test message.")
+        self.click(self.widget("button", "Send"))
+        await self.rerun("contact")
+
+
+async def run_sessions(url, n, args, prompts, questions, pid):
+    """One untimed flow, then `n` flows at once. Returns the sessions, the
+    warm-up session, the elapsed time and the server's RSS before and at
+    its peak."""
+    warmup = Session(url, -1, args.seed, 1, prompts, questions)
+    await warmup.connect()
+    await warmup.run()
+    await warmup.close()
+    sessions = [Session(url, i, args.seed, args.switches, prompts, questions) for i in range(n)]
+    await asyncio.gather(*(session.connect() for session in sessions))
+    before = rss_bytes(pid)
+    with MemorySampler(pid) as memory:
+        started = time.perf_counter()
+        await asyncio.gather(*(session.run() for session in sessions))
+        elapsed = time.perf_counter() - started
+    await asyncio.gather(*(session.close() for session in sessions))
+    return sessions, warmup, elapsed, before, memory.peak
+
+
+# --- REPORTING ---
+def latency_summary(samples):
+    from metrics import percentile
+    return {
+        "count": len(samples),
+        "p50": percentile(samples, 0.50),
+        "p95": percentile(samples, 0.95),
+        "p99": percentile(samples, 0.99),
+        "max": max(samples, default=0.0),
+    }
+
+
+def run_level(n, args, secrets, prompts, questions, smtp):
+    """Start a server, run `n` sessions against it and collect their flows."""
+    received = smtp.messages
+    with Server(secrets) as server:
+        sessions, warmup, elapsed, before, peak = asyncio.run(
+            run_sessions(server.url, n, args, prompts, questions, server.proc.pid))
+    errors = [f"warm-up {e}" for e in warmup.errors]
+    errors += [f"session {i}: {e}" for i, session in enumerate(sessions) for e in session.errors]
+    if server.stats is None:
+        errors.append("server wrote no upstream stats on shutdown")
+    if errors:
+        # Timings of broken flows would describe a different workload.
+        return {"sessions": n, "failed": True, "errors": errors}
+    timings = [t for session in sessions for t in session.timings]
+    return {
+        "sessions": n,
+        "failed": False,
+        "elapsed": elapsed,
+        "reruns": len(timings),
+        "reruns_per_sec": len(timings) / elapsed,
+        "flows_per_min": n / elapsed * 60,
+        "latency": latency_summary([seconds for _, seconds in timings]),
+        "steps": {step: latency_summary([seconds for name, seconds in timings if name == step])
+                  for step in STEPS},
+        # Growth of the one server process while the sessions ran, and its peak.
+        "rss_per_session": max(0, peak - before) / n,
+        "rss_server": peak,
+        # Counted over the whole server lifetime, warm-up flow included.
+        "upstream": {**server.stats, "smtp_messages": smtp.messages - received},
+        "errors": [],
+    }
+
+
+def print_level(result):
+    if result["failed"]:
+        print(f"{result['sessions']:>8}  failed: {len(result['errors'])} errors, results left out")
+        return
+    latency = result["latency"]
+    print(f"{result['sessions']:>8}{result['reruns_per_sec']:>11.1f}{result['flows_per_min']:>11.1f}"
+          f"{latency['p50'] * 1000:>10.0f}{latency['p95'] * 1000:>10.0f}{latency['p99'] * 1000:>10.0f}"
+          f"{result['rss_per_session'] / 2 ** 20:>12.1f}{result['rss_server'] / 2 ** 20:>12.1f}")
+
+
+def print_steps(result):
+    print(f"\nper step at {result['sessions']} sessions (ms):")
+    print(f"{'step':<14}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for step, summary in result["steps"].items():
+        if summary["count"]:
+            print(f"{step:<14}" + "".join(f"{summary[q] * 1000:>10.0f}" for q in ("p50", "p95", "p99", "max")))
+
+
+def main():
+    if sys.argv[1:2] == ["--serve"]:
+        # Internal: the server side of one level, started by Server.
+        port, secrets_path, stats_path = sys.argv[2:5]
+        serve(int(port), secrets_path, stats_path)
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=SESSION_LEVELS,
+                        help="concurrency levels to run, in order")
+    parser.add_argument("--switches", type=int, default=ASSET_SWITCHES,
+                        help="asset + timeframe changes per session")
+    parser.add_argument("--seed", type=int, default=0, help="seed for every session's choices")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/load-<commit>.json)")
+    args = parser.parse_args()
+
+    from quiz_store import questions
+    from static_content import load_quiz
+
+    commit, dirty = git_commit()
+    prompts = [response["prompt"] for response in load_gemini()]
+    quiz_questions = questions(load_quiz())
+    levels = []
+    with FixtureSMTPServer() as smtp:
+        secrets = {"gemini": {"api_key": "fixture"}, "email": smtp.secrets()}
+        print(f"{'sessions':>8}{'reruns/s':>11}{'flows/min':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'MiB/session':>12}{'MiB/server':>12}")
+        for n in args.sessions:
+            levels.append(run_level(n, args, secrets, prompts, quiz_questions, smtp))
+            print_level(levels[-1])
+    passed = [level for level in levels if not level["failed"]]
+    if passed:
+        print_steps(passed[-1])
+        print(f"\nupstream calls at {passed[-1]['sessions']} sessions: {passed[-1]['upstream']}")
+    for level in levels:
+        for error in level["errors"][:5]:
+            print(f"error at {level['sessions']} sessions: {error}")
+
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "cpus": os.cpu_count(),
+        "packages": package_versions(),
+        "switches": args.switches,
+        "seed": args.seed,
+        "levels": levels,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"saved {output}")
+    failed = [str(level["sessions"]) for level in levels if level["failed"]]
+    if failed:
+        sys.exit(f"flows failed at {', '.join(failed)} sessions")
+
+
+if __name__ == "__main__":
+    main()
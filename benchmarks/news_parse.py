@@ -0,0 +1,77 @@
+"""Full-tree vs streaming RSS parsing: parse time and peak memory.
+
+Run from the repository root:
+
+    python benchmarks/news_parse.py [--items 5000] [--limit 10]
+
+The feed is synthetic and built in memory, so no network is needed. Both
+modes consume the same 16 KiB chunks; the full-tree mode joins them first,
+as `response.content` does.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news import NEWS_CHUNK_SIZE, parse_feed, parse_feed_stream  # noqa: E402
+
+
+def make_feed(items, body_size=2000):
+    body = "Lorem ipsum dolor sit amet. " * (body_size // 28)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Bench</title>']
+    for i in range(items):
+        parts.append(
+            f"<item><title>Headline {i}</title><link>https://example.com/news/{i}</link>"
+            f"<pubDate>Mon, 01 Jan 2024 00:{i % 60:02d}:00 GMT</pubDate>"
+            f"<description>{body}</description></item>"
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+
+def chunked(content, size=NEWS_CHUNK_SIZE):
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+def full_tree(content, limit):
+    return parse_feed(b"".join(chunked(content)), "Bench", limit)
+
+
+def streaming(content, limit):
+    return parse_feed_stream(chunked(content), "Bench", limit)
+
+
+def measure(func, content, limit, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content, limit)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func(content, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000, help="items in the synthetic feed")
+    parser.add_argument("--limit", type=int, default=10, help="items to keep")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = make_feed(args.items)
+    assert full_tree(content, args.limit) == streaming(content, args.limit)
+    print(f"feed: {args.items} items, {len(content) / 1024:.0f} KiB, keeping {args.limit}")
+    for name, func in (("full-tree", full_tree), ("streaming", streaming)):
+        best, peak = measure(func, content, args.limit, args.repeat)
+        print(f"{name:>10}: {best * 1000:8.2f} ms   peak {peak / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
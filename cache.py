@@ -0,0 +1,135 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Process-wide caches shared by every session. Streamlit re-executes app.py on
+# each rerun, so anything meant to outlive a rerun has to live in a module.
+
+
+def _sizeof(value):
+    if hasattr(value, "memory_usage"):
+        try:
+            return int(value.memory_usage(index=True, deep=True).sum())
+        except Exception:
+            pass
+    return sys.getsizeof(value)
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# --- TTL + LRU CACHE WITH SINGLE-FLIGHT ---
+class TTLCache:
+    """Thread-safe TTL cache with LRU eviction under a byte budget.
+
+    Concurrent callers asking for a key that is already being fetched wait on
+    that fetch instead of starting their own.
+    """
+
+    def __init__(self, ttl=60, max_bytes=64 * 1024 * 1024, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._inflight = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get_or_fetch(self, key, fetch):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                self._drop(key)
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                waiter = self._inflight[key] = _InFlight()
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+                self.coalesced += 1
+
+        if not owner:
+            waiter.done.wait()
+            if waiter.error is not None:
+                raise waiter.error
+            return waiter.value
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            waiter.error = e
+            raise
+        else:
+            waiter.value = value
+            # Empty frames usually mean Yahoo throttled us; don't pin them.
+            if not getattr(value, "empty", False):
+                self.put(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            waiter.done.set()
+
+    def get(self, key, default=None):
+        """Fresh cached value for `key`, or `default`; never fetches."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = _sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (self._clock() + self.ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._drop(key)
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,235 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from downsample import lttb, ohlc_buckets
+
+# Market figures are shared across sessions, keyed by the view they show.
+# An unchanged view reuses its figure outright; when new bars arrive only the
+# trace arrays are swapped, leaving subplots, shapes and styling untouched.
+
+FIGURE_CACHE_SIZE = 64
+
+# Point budgets derive from the rendered chart width: about one line vertex
+# per pixel, and a few pixels per candle so bodies stay visible.
+CHART_WIDTH_PX = 1400
+LINE_POINTS_PER_PX = 1.0
+CANDLE_WIDTH_PX = 3
+
+
+def point_budgets(width_px=CHART_WIDTH_PX):
+    return int(width_px * LINE_POINTS_PER_PX), max(3, width_px // CANDLE_WIDTH_PX)
+
+
+def data_version(df):
+    """Cheap fingerprint of a market frame: its span, latest bar and warm-up."""
+    if df.empty:
+        return (0,)
+    last = df.iloc[-1]
+    # Indicator warm-up length depends on how much history fed the engine.
+    warmup = (int(df['SMA_20'].isna().sum()), int(df['RSI'].isna().sum()))
+    return (len(df), df.index[0], df.index[-1],
+            float(last['Open']), float(last['High']), float(last['Low']), float(last['Close']), warmup)
+
+
+def _apply_data(fig, df, chart_type):
+    line_budget, candle_budget = point_budgets()
+    with fig.batch_update():
+        price, sma, rsi = fig.data
+        if chart_type == "Candlestick":
+            price.x, price.open, price.high, price.low, price.close = ohlc_buckets(
+                df.index, df['Open'], df['High'], df['Low'], df['Close'], candle_budget)
+        else:
+            price.x, price.y = lttb(df.index, df['Close'], line_budget)
+        sma.x, sma.y = lttb(df.index, df['SMA_20'], line_budget)
+        rsi.x, rsi.y = lttb(df.index, df['RSI'], line_budget)
+
+
+# --- MARKET FIGURE (Plotly) ---
+def build_market_figure(df, chart_type):
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                        vertical_spacing=0.05, row_heights=[0.7, 0.3])
+
+    # Main Chart (Candles)
+    if chart_type == "Candlestick":
+        fig.add_trace(go.Candlestick(name='OHLC'), row=1, col=1)
+    else:
+        fig.add_trace(go.Scatter(mode='lines', name='Price', line=dict(color='#00BFA5')), row=1, col=1)
+
+    # Add SMA
+    fig.add_trace(go.Scatter(mode='lines', name='SMA 20', line=dict(color='orange', width=1)), row=1, col=1)
+
+    # RSI Sub-chart
+    fig.add_trace(go.Scatter(name='RSI', line=dict(color='#A020F0')), row=2, col=1)
+
+    # RSI Lines
+    fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
+    fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
+
+    # Layout styling
+    fig.update_layout(
+        height=600,
+        margin=dict(l=20, r=20, t=30, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0.1)',
+        font=dict(color="white"),
+        xaxis_rangeslider_visible=False
+    )
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.1)')
+
+    _apply_data(fig, df, chart_type)
+    return fig
+
+
+# --- BACKTEST FIGURES ---
+def build_backtest_figure(result):
+    """Strategy vs buy-and-hold equity, with the strategy's drawdown below."""
+    line_budget, _ = point_budgets()
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                        vertical_spacing=0.05, row_heights=[0.7, 0.3])
+    for column, name, color in (("Equity", "Strategy", '#00BFA5'), ("BuyHold", "Buy & Hold", '#ADB5BD')):
+        x, y = lttb(result.index, result[column], line_budget)
+        fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=name, line=dict(color=color)), row=1, col=1)
+    x, y = lttb(result.index, result['Drawdown'] * 100, line_budget)
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name='Drawdown %', fill='tozeroy',
+                             line=dict(color='#FF4B4B', width=1)), row=2, col=1)
+    fig.update_layout(
+        height=450,
+        margin=dict(l=20, r=20, t=30, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0.1)',
+        font=dict(color="white"),
+    )
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.1)')
+    return fig
+
+
+def build_sweep_heatmap(grid, title):
+    """Total return (%) of an RSI sweep as a buy x sell threshold heatmap."""
+    table = grid.pivot_table(index="buy", columns="sell", values="total_return") * 100
+    fig = go.Figure(go.Heatmap(z=table.values, x=table.columns, y=table.index, colorscale="RdYlGn",
+                               zmid=0, colorbar=dict(title="Return %")))
+    fig.update_layout(
+        title=title,
+        height=450,
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="white"),
+        xaxis_title="Sell above RSI",
+        yaxis_title="Buy below RSI",
+    )
+    return fig
+
+
+# --- COMPARISON FIGURES ---
+PAIR_COLORS = ['#F7931A', '#627EEA', '#00FFA3', '#0033AD', '#A020F0', '#C2A633']
+
+
+def _comparison_layout(fig, title, yaxis_title):
+    fig.update_layout(
+        title=title,
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0.1)',
+        font=dict(color="white"),
+        yaxis_title=yaxis_title,
+        legend=dict(orientation="h"),
+    )
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.1)')
+    return fig
+
+
+def build_lines_figure(frame, title, yaxis_title):
+    """One line per column of a (time x pair) frame."""
+    fig = go.Figure()
+    for column, color in zip(frame.columns, PAIR_COLORS * 2):
+        fig.add_trace(go.Scatter(x=frame.index, y=frame[column], mode='lines', name=str(column).split("-")[0],
+                                 line=dict(color=color, width=1.5)))
+    return _comparison_layout(fig, title, yaxis_title)
+
+
+def build_correlation_heatmap(matrix, labels, title):
+    labels = [str(label).split("-")[0] for label in labels]
+    fig = go.Figure(go.Heatmap(z=matrix, x=labels, y=labels, zmin=-1, zmax=1, colorscale="RdBu",
+                               reversescale=True, texttemplate="%{z:.2f}",
+                               colorbar=dict(title="ρ")))
+    fig.update_layout(
+        title=title,
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="white"),
+        yaxis=dict(autorange="reversed"),
+    )
+    return fig
+
+
+class _Entry:
+    def __init__(self, fig, version):
+        self.fig = fig
+        self.version = version
+        self.lock = threading.Lock()
+
+
+class FigureCache:
+    """LRU of market figures keyed by (symbol, timeframe, interval, chart_type, live).
+
+    Live views get their own entries: their last bar moves with every tick,
+    and sharing an entry with the settled view would make the two keep
+    re-patching each other's figure.
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.patches = 0
+        self.builds = 0
+
+    def _entry(self, key, df, chart_type, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry, False
+        entry = _Entry(build_market_figure(df, chart_type), version)
+        with self._lock:
+            self.builds += 1
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry, True
+
+    @contextmanager
+    def figure(self, symbol, timeframe, interval, chart_type, df, live=False):
+        """Yield an up-to-date figure for the view, locked while in use.
+
+        Render it inside the block so a concurrent patch from another session
+        cannot change the traces mid-serialization.
+        """
+        version = data_version(df)
+        key = (symbol, timeframe, interval, chart_type, live)
+        entry, built = self._entry(key, df, chart_type, version)
+        with entry.lock:
+            if entry.version != version:
+                _apply_data(entry.fig, df, chart_type)
+                entry.version = version
+                self.patches += 1
+            elif not built:
+                self.hits += 1
+            yield entry.fig
+
+    def stats(self):
+        return {"hits": self.hits, "patches": self.patches, "builds": self.builds,
+                "entries": len(self._entries)}
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,168 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Side-by-side statistics for all pairs, computed on an aligned
+# (time x symbol) close matrix: normalized returns, rolling volatility and
+# rolling pairwise correlation. Rolling windows come from running sums of
+# returns, squares and cross-products, so when the matrix gains bars (or its
+# latest bar changes) only the affected rows are recomputed; every earlier
+# row is reused from the previous version.
+
+ROLLING_WINDOWS = [7, 14, 30, 60]
+DEFAULT_WINDOW = 30
+PERIODS_PER_YEAR = 365   # crypto trades every day
+
+
+def align(closes):
+    """Forward-fill gaps and drop leading rows until every pair has a price."""
+    return closes.sort_index().ffill().dropna()
+
+
+def _running_sums(returns):
+    """Cumulative sums with a leading zero row: (x, x^2, x_i * x_j)."""
+    zeros = np.zeros((1,) + returns.shape[1:])
+    s1 = np.concatenate((zeros, np.cumsum(returns, axis=0)))
+    s2 = np.concatenate((zeros, np.cumsum(returns ** 2, axis=0)))
+    cross = returns[:, :, None] * returns[:, None, :]
+    sxy = np.concatenate((zeros[:, :, None] * zeros[:, None, :], np.cumsum(cross, axis=0)))
+    return s1, s2, sxy
+
+
+def _rolling(s1, s2, sxy, window, start):
+    """Volatility and correlation for return rows `start`.. from running sums.
+
+    Rows whose window is not full yet are NaN. A running sum row m covers
+    returns [0, m), so the window ending at return row j is s[j + 1] - s[j + 1 - window].
+    """
+    end = np.arange(start, len(s1) - 1) + 1
+    begin = end - window
+    full = begin >= 0
+    begin = np.maximum(begin, 0)
+    n = float(window)
+    mean = (s1[end] - s1[begin]) / n
+    var = np.maximum((s2[end] - s2[begin]) / n - mean ** 2, 0.0)
+    cov = (sxy[end] - sxy[begin]) / n - mean[:, :, None] * mean[:, None, :]
+    std = np.sqrt(var)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.clip(cov / (std[:, :, None] * std[:, None, :]), -1.0, 1.0)
+    vol = std * np.sqrt(n / (n - 1)) * np.sqrt(PERIODS_PER_YEAR)
+    vol[~full] = np.nan
+    corr[~full] = np.nan
+    return vol, corr
+
+
+class RollingComparison:
+    """Comparison statistics for one (timeframe, window) view.
+
+    `update` takes the current close matrix and recomputes from the first
+    row that differs from the previous version. The matrix may also have
+    lost rows at the start (a trailing timeframe moving forward); running
+    sums are only ever differenced, so they are reused without rebasing.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.index = None
+        self.columns = None
+        self._closes = None
+        self._sums = None
+        self._vol = None
+        self._corr = None
+        self.lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+        self.rows_recomputed = 0
+
+    def _first_change(self, index, columns, closes):
+        """(offset into the old rows, first new row that differs), or None."""
+        if self.index is None or list(columns) != list(self.columns) or not len(index):
+            return None
+        offset = self.index.searchsorted(index[0])
+        if offset >= len(self.index) or self.index[offset] != index[0]:
+            return None
+        overlap = min(len(self.index) - offset, len(index))
+        if not self.index[offset:offset + overlap].equals(index[:overlap]):
+            return None
+        same = (self._closes[offset:offset + overlap] == closes[:overlap]).all(axis=1)
+        changed = np.flatnonzero(~same)
+        return offset, int(changed[0]) if len(changed) else overlap
+
+    def update(self, closes):
+        """Bring the statistics up to `closes`; False if nothing changed."""
+        closes = align(closes)
+        index, columns, values = closes.index, closes.columns, closes.to_numpy(dtype=float)
+        change = self._first_change(index, columns, values)
+        if change == (0, len(index)) and len(index) == len(self.index):
+            self.hits += 1
+            return False
+        if change is None or change[1] == 0:
+            start = 0
+            sums = _running_sums(np.log(values[1:] / values[:-1]))
+            vol, corr = _rolling(*sums, self.window, 0)
+            self.builds += 1
+        else:
+            offset, first = change
+            # Return row j spans closes j and j + 1; rows before first - 1 are untouched.
+            start = first - 1
+            old = [s[offset:offset + start + 1] for s in self._sums]
+            tail = _running_sums(np.log(values[start + 1:] / values[start:-1]))
+            sums = [np.concatenate((o, o[-1] + t[1:])) for o, t in zip(old, tail)]
+            vol_tail, corr_tail = _rolling(*sums, self.window, start)
+            vol = np.concatenate((self._vol[offset:offset + start], vol_tail))
+            corr = np.concatenate((self._corr[offset:offset + start], corr_tail))
+            if offset:
+                # Windows reaching before the new first row are not full any more.
+                vol[:self.window - 1] = np.nan
+                corr[:self.window - 1] = np.nan
+        self.rows_recomputed += len(values) - 1 - start
+        self.index, self.columns, self._closes = index, columns, values
+        self._sums, self._vol, self._corr = sums, vol, corr
+        return True
+
+    def snapshot(self):
+        """Frames for the view. Updates replace the arrays rather than
+        writing into them, so a snapshot stays valid after the lock is released.
+
+        `correlation` is a (date x symbol x symbol) array aligned with `dates`.
+        """
+        return {
+            "normalized": pd.DataFrame(self._closes / self._closes[0] * 100, index=self.index,
+                                       columns=self.columns),
+            "volatility": pd.DataFrame(self._vol, index=self.index[1:], columns=self.columns),
+            "correlation": self._corr,
+            "dates": self.index[1:],
+            "symbols": list(self.columns),
+        }
+
+
+class ComparisonCache:
+    """Process-wide RollingComparison per (timeframe, window)."""
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def view(self, key, window):
+        with self._lock:
+            view = self._views.get(key)
+            if view is None:
+                view = self._views[key] = RollingComparison(window)
+            return view
+
+    def get(self, timeframe, window, closes):
+        """Up-to-date RollingComparison.snapshot() for the view."""
+        view = self.view((timeframe, window), window)
+        with view.lock:
+            view.update(closes)
+            return view.snapshot()
+
+    def stats(self):
+        with self._lock:
+            views = list(self._views.values())
+        return {"views": len(views), "builds": sum(v.builds for v in views),
+                "hits": sum(v.hits for v in views), "rows_recomputed": sum(v.rows_recomputed for v in views)}
+
+
+comparison_cache = ComparisonCache()
@@ -0,0 +1,71 @@
+import numpy as np
+
+# Reduce long series to roughly one point per horizontal pixel before they are
+# handed to Plotly. Series already within budget pass through untouched.
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of the points to keep.
+
+    `x` must be increasing and `y` free of NaN. The first and last points are
+    always kept. Bucket edges, next-bucket averages and triangle areas are
+    computed with NumPy; only the bucket walk itself is sequential, because
+    each choice anchors on the point selected in the previous bucket.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Interior points split into n_out - 2 buckets.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    # Average of each bucket's successor; the last bucket looks at the end point.
+    csum_x = np.concatenate(([0.0], np.cumsum(x)))
+    csum_y = np.concatenate(([0.0], np.cumsum(y)))
+    next_starts = np.append(starts[1:], n - 1)
+    next_ends = np.append(ends[1:], n)
+    counts = next_ends - next_starts
+    avg_x = (csum_x[next_ends] - csum_x[next_starts]) / counts
+    avg_y = (csum_y[next_ends] - csum_y[next_starts]) / counts
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i, (lo, hi) in enumerate(zip(starts, ends)):
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - avg_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (avg_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def lttb(index, values, n_out):
+    """Downsample a (index, values) line; leading/inner NaNs are dropped first."""
+    values = np.asarray(values, dtype=float)
+    if len(values) <= n_out:
+        return index, values
+    keep = ~np.isnan(values)
+    index, values = index[keep], values[keep]
+    if len(values) <= n_out:
+        return index, values
+    x = index.asi8 if hasattr(index, "asi8") else np.arange(len(index))
+    idx = lttb_indices(x, values, n_out)
+    return index[idx], values[idx]
+
+
+def ohlc_buckets(index, open_, high, low, close, n_out):
+    """Aggregate bars into at most `n_out` candles (first/max/min/last)."""
+    n = len(index)
+    if n <= n_out:
+        return index, open_, high, low, close
+    starts = np.unique(np.linspace(0, n, n_out, endpoint=False).astype(np.int64))
+    ends = np.append(starts[1:], n) - 1
+    return (
+        index[starts],
+        np.asarray(open_, dtype=float)[starts],
+        np.maximum.reduceat(np.asarray(high, dtype=float), starts),
+        np.minimum.reduceat(np.asarray(low, dtype=float), starts),
+        np.asarray(close, dtype=float)[ends],
+    )
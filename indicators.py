@@ -0,0 +1,298 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# --- HELPER: CALCULATE RSI ---
+def calculate_rsi(data, window=14):
+    delta = data['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def calculate_sma(data, window=20):
+    return data['Close'].rolling(window=window).mean()
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+# --- BATCHED INDICATORS OVER A (TIME x SYMBOL) MATRIX ---
+def _rolling_mean(values, window):
+    # Same semantics as Series.rolling(window).mean(): NaN until the window is
+    # full, and NaN for any window that contains a NaN.
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = sliding_window_view(values, window, axis=0).mean(axis=-1)
+    return out
+
+
+def sma_matrix(closes, window=20):
+    values = np.asarray(closes, dtype=float)
+    return _rolling_mean(values, window)
+
+
+def rsi_matrix(closes, window=14):
+    values = np.asarray(closes, dtype=float)
+    delta = np.full(values.shape, np.nan)
+    delta[1:] = values[1:] - values[:-1]
+    # NaN compares False, so missing changes count as 0 just like Series.where.
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    return _rsi_from_averages(_rolling_mean(gain, window), _rolling_mean(loss, window))
+
+
+def indicator_matrix(closes, sma_window=20, rsi_window=14):
+    """SMA and RSI for every column of a (time x symbol) close matrix.
+
+    Produces the same numbers as calculate_sma/calculate_rsi applied to each
+    column separately. DataFrame input returns DataFrames with the same index
+    and columns; array input returns arrays.
+    """
+    sma = sma_matrix(closes, sma_window)
+    rsi = rsi_matrix(closes, rsi_window)
+    if isinstance(closes, pd.DataFrame):
+        sma = pd.DataFrame(sma, index=closes.index, columns=closes.columns)
+        rsi = pd.DataFrame(rsi, index=closes.index, columns=closes.columns)
+    return sma, rsi
+
+
+# --- STREAMING INDICATORS ---
+# Each indicator consumes one close at a time in O(1). `push` appends a new
+# bar; `amend` replaces the close of the latest bar (a live tick on a bar that
+# has not closed yet) without replaying history.
+
+class StreamingSMA:
+    def __init__(self, window=20):
+        self.window = window
+        self._buf = np.zeros(window)
+        self._count = 0
+        self._sum = 0.0
+
+    def _value(self):
+        return self._sum / self.window if self._count >= self.window else np.nan
+
+    def push(self, close):
+        slot = self._count % self.window
+        if slot == 0 and self._count:
+            # Re-sum once per wrap so floating-point drift cannot accumulate.
+            self._sum = float(self._buf.sum())
+        self._sum += close - self._buf[slot]
+        self._buf[slot] = close
+        self._count += 1
+        return self._value()
+
+    def amend(self, close):
+        slot = (self._count - 1) % self.window
+        self._sum += close - self._buf[slot]
+        self._buf[slot] = close
+        return self._value()
+
+
+class StreamingRSI:
+    """RSI over a simple rolling mean of gains/losses; matches calculate_rsi."""
+
+    def __init__(self, window=14):
+        self.window = window
+        self._gains = np.zeros(window)
+        self._losses = np.zeros(window)
+        self._count = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._prev_close = np.nan
+        self._last_close = np.nan
+
+    def _value(self):
+        if self._count < self.window:
+            return np.nan
+        return float(_rsi_from_averages(self._gain_sum / self.window, self._loss_sum / self.window))
+
+    def _set(self, slot, delta):
+        # The first bar has no previous close; calculate_rsi counts it as 0.
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self._gain_sum += gain - self._gains[slot]
+        self._loss_sum += loss - self._losses[slot]
+        self._gains[slot] = gain
+        self._losses[slot] = loss
+
+    def push(self, close):
+        slot = self._count % self.window
+        if slot == 0 and self._count:
+            self._gain_sum = float(self._gains.sum())
+            self._loss_sum = float(self._losses.sum())
+        self._set(slot, close - self._last_close)
+        self._prev_close, self._last_close = self._last_close, close
+        self._count += 1
+        return self._value()
+
+    def amend(self, close):
+        self._set((self._count - 1) % self.window, close - self._prev_close)
+        self._last_close = close
+        return self._value()
+
+
+class StreamingWilderRSI:
+    """Wilder-smoothed RSI: seeded with a simple mean, then exponential decay."""
+
+    def __init__(self, window=14):
+        self.window = window
+        self._count = 0          # number of price changes seen
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._prev_state = (0, 0.0, 0.0)
+        self._prev_close = np.nan
+        self._last_close = np.nan
+
+    def _advance(self, delta):
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        n = self.window
+        self._count += 1
+        if self._count <= n:
+            # Seed phase: accumulate a plain mean over the first `window` changes.
+            self._avg_gain += (gain - self._avg_gain) / self._count
+            self._avg_loss += (loss - self._avg_loss) / self._count
+        else:
+            self._avg_gain = (self._avg_gain * (n - 1) + gain) / n
+            self._avg_loss = (self._avg_loss * (n - 1) + loss) / n
+
+    def _value(self):
+        if self._count < self.window:
+            return np.nan
+        return float(_rsi_from_averages(self._avg_gain, self._avg_loss))
+
+    def push(self, close):
+        self._prev_state = (self._count, self._avg_gain, self._avg_loss)
+        if not np.isnan(self._last_close):
+            self._advance(close - self._last_close)
+        self._prev_close, self._last_close = self._last_close, close
+        return self._value()
+
+    def amend(self, close):
+        self._count, self._avg_gain, self._avg_loss = self._prev_state
+        if not np.isnan(self._prev_close):
+            self._advance(close - self._prev_close)
+        self._last_close = close
+        return self._value()
+
+
+INDICATORS = {
+    "sma": StreamingSMA,
+    "rsi": StreamingRSI,
+    "rsi_wilder": StreamingWilderRSI,
+}
+# Leading bars a fresh stream leaves NaN, as rolling(window).mean() does.
+WARMUP_BARS = {
+    "sma": lambda window: window - 1,
+    "rsi": lambda window: window - 1,
+    "rsi_wilder": lambda window: window,
+}
+
+
+class _Stream:
+    """Indicator state plus preallocated timestamp/value history."""
+
+    def __init__(self, indicator, window, capacity):
+        self._factory = lambda: INDICATORS[indicator](window)
+        self._capacity = capacity
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.state = self._factory()
+        self.ts = np.empty(self._capacity, dtype=np.int64)
+        self.closes = np.empty(self._capacity)
+        self.values = np.empty(self._capacity)
+        self.n = 0
+
+    def _grow(self):
+        size = len(self.ts) * 2
+        for name in ("ts", "closes", "values"):
+            old = getattr(self, name)
+            new = np.empty(size, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def push(self, ts, close):
+        if self.n == len(self.ts):
+            self._grow()
+        self.ts[self.n] = ts
+        self.closes[self.n] = close
+        self.values[self.n] = self.state.push(close)
+        self.n += 1
+
+    def amend(self, close):
+        self.closes[self.n - 1] = close
+        self.values[self.n - 1] = self.state.amend(close)
+
+    def sync(self, ts, closes):
+        """Bring the stream up to date with `ts`/`closes`; return aligned values."""
+        if self.n:
+            last = self.ts[self.n - 1]
+            pos = int(np.searchsorted(ts, last))
+            known = pos < len(ts) and ts[pos] == last
+            if known and pos + 1 <= self.n and np.array_equal(self.ts[self.n - pos - 1:self.n], ts[:pos + 1]):
+                if closes[pos] != self.closes[self.n - 1]:
+                    self.amend(closes[pos])
+                for t, c in zip(ts[pos + 1:], closes[pos + 1:]):
+                    self.push(t, c)
+                return self.values[self.n - len(ts):self.n].copy()
+            self.reset()
+        for t, c in zip(ts, closes):
+            self.push(t, c)
+        return self.values[:self.n].copy()
+
+
+class IndicatorEngine:
+    """Per-(symbol, indicator, window) streaming state shared across reruns.
+
+    Feeding the same series again costs nothing; appending a bar or moving
+    the close of the latest bar is O(1) per indicator. A stream may hold bars
+    from before the series it is given (another session's longer timeframe,
+    or a window that slid forward); the warm-up bars of the result are
+    always NaN and the first RSI is taken from the series alone, so SMA and
+    simple RSI depend only on the series itself.
+    Wilder's RSI is a recursive average and keeps some of that history.
+    """
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def _stream(self, symbol, indicator, window):
+        key = (symbol, indicator, window)
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = _Stream(indicator, window, self.capacity)
+            return stream
+
+    def compute(self, symbol, close, indicator, window):
+        """Return `indicator` over the `close` Series, aligned to its index."""
+        ts = close.index.asi8 if isinstance(close.index, pd.DatetimeIndex) else np.arange(len(close))
+        stream = self._stream(symbol, indicator, window)
+        closes = close.to_numpy(dtype=float)
+        with stream.lock:
+            values = stream.sync(ts, closes)
+        values[:WARMUP_BARS[indicator](window)] = np.nan
+        if indicator == "rsi" and len(values) >= window:
+            # calculate_rsi counts the change into the first bar as 0; a
+            # stream holding earlier bars knows the real one.
+            values[window - 1] = rsi_matrix(closes[:window], window)[-1]
+        return pd.Series(values, index=close.index, name=f"{indicator}_{window}")
+
+    def sma(self, symbol, close, window=20):
+        return self.compute(symbol, close, "sma", window)
+
+    def rsi(self, symbol, close, window=14, wilder=False):
+        return self.compute(symbol, close, "rsi_wilder" if wilder else "rsi", window)
+
+
+indicator_engine = IndicatorEngine()
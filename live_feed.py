@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pandas as pd
+import yfinance as yf
+
+from market_data import ASSET_PAIRS, BAR_RULES
+
+# One poller per process fetches the latest price of every listed pair in a
+# single request and publishes it for all sessions. It only polls while some
+# session in live mode has asked for a tick recently.
+
+LIVE_POLL_INTERVAL = 5   # seconds between upstream polls
+LIVE_IDLE_AFTER = 30     # stop polling when nobody has read a tick for this long
+
+
+def yahoo_ticks(symbols):
+    """Latest 1m bar of each symbol as {symbol: {'ts', 'price', 'high', 'low'}}."""
+    raw = yf.download(list(symbols), period="1d", interval="1m", group_by="ticker",
+                      auto_adjust=True, threads=True, progress=False)
+    ticks = {}
+    for symbol in symbols:
+        if symbol not in raw.columns.get_level_values(0):
+            continue
+        bars = raw[symbol].dropna(subset=["Close"])
+        if bars.empty:
+            continue
+        last = bars.iloc[-1]
+        ticks[symbol] = {"ts": bars.index[-1], "price": float(last["Close"]),
+                         "high": float(last["High"]), "low": float(last["Low"])}
+    return ticks
+
+
+class LiveFeed:
+    """Shared tick poller; `source(symbols)` returns the latest ticks.
+
+    `source` defaults to a batched Yahoo request and can be swapped for a
+    local stand-in feed.
+    """
+
+    def __init__(self, symbols, source=yahoo_ticks, interval=LIVE_POLL_INTERVAL, idle_after=LIVE_IDLE_AFTER):
+        self.symbols = list(symbols)
+        self.source = source
+        self.interval = interval
+        self.idle_after = idle_after
+        self._ticks = {}
+        self._last_demand = 0.0
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.version = 0
+        self.polls = 0
+        self.failures = 0
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            if time.monotonic() - self._last_demand > self.idle_after:
+                # Nobody is watching; sleep until a session asks again.
+                self._wake.wait()
+            self._wake.clear()
+            try:
+                self.poll()
+            except Exception:
+                self.failures += 1
+            time.sleep(self.interval)
+
+    def poll(self):
+        ticks = self.source(self.symbols)
+        self.polls += 1
+        if ticks:
+            self._ticks = {**self._ticks, **ticks}
+            self.version += 1
+
+    def latest(self, symbol):
+        """Most recent tick for `symbol` (or None); also keeps the poller awake."""
+        self._last_demand = time.monotonic()
+        self._wake.set()
+        self._ensure_running()
+        return self._ticks.get(symbol)
+
+
+def apply_tick(df, tick, interval="1d"):
+    """Fold a tick into the newest bar, or open a new bar when it starts one."""
+    if tick is None or df.empty:
+        return df
+    ts = pd.Timestamp(tick["ts"])
+    if df.index.tz is not None:
+        ts = (ts.tz_localize("UTC") if ts.tz is None else ts).tz_convert(df.index.tz)
+    elif ts.tz is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    bar = ts.floor(BAR_RULES[interval])
+    last = df.index[-1]
+    price = tick["price"]
+    if bar < last:
+        return df
+    out = df.copy()
+    if bar == last:
+        out.iloc[-1, out.columns.get_loc("Close")] = price
+        out.iloc[-1, out.columns.get_loc("High")] = max(out["High"].iloc[-1], tick.get("high", price))
+        out.iloc[-1, out.columns.get_loc("Low")] = min(out["Low"].iloc[-1], tick.get("low", price))
+    else:
+        row = {column: float("nan") for column in out.columns}
+        row.update(Open=price, High=price, Low=price, Close=price)
+        if "Volume" in row:
+            row["Volume"] = 0.0
+        out.loc[bar] = row
+    return out
+
+
+live_feed = LiveFeed(ASSET_PAIRS.values())
@@ -0,0 +1,169 @@
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from metrics import metrics
+
+# Contact-form mail goes through one background worker per process. The form
+# only enqueues; the worker keeps an authenticated SMTP connection open across
+# messages and retries transient failures with exponential backoff.
+
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+MAIL_QUEUE_SIZE = 100
+MAIL_MAX_RETRIES = 3
+MAIL_BACKOFF = 1.0       # seconds; doubled on every retry
+MAIL_IDLE_TIMEOUT = 60   # close the SMTP connection after this much idle time
+MAIL_TIMEOUT = 10
+
+
+def build_message(sender_email, receiver_email, user_email, user_message):
+    msg = MIMEMultipart()
+    msg['From'] = sender_email
+    msg['To'] = receiver_email
+    msg['Subject'] = f"New Inquiry from {user_email}"
+
+    body = f"User Email: {user_email}\n\nMessage:\n{user_message}"
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def _is_transient(error):
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+
+class MailQueue:
+    """Bounded queue drained by a single SMTP worker thread.
+
+    `smtp_factory` defaults to smtplib.SMTP; point `host`/`port` at a local
+    stand-in (e.g. aiosmtpd) with `starttls=False` to exercise it offline.
+    """
+
+    def __init__(self, sender_email, sender_password, receiver_email, host=SMTP_HOST, port=SMTP_PORT,
+                 starttls=True, maxsize=MAIL_QUEUE_SIZE, max_retries=MAIL_MAX_RETRIES, backoff=MAIL_BACKOFF,
+                 idle_timeout=MAIL_IDLE_TIMEOUT, timeout=MAIL_TIMEOUT, smtp_factory=smtplib.SMTP):
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.receiver_email = receiver_email
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.smtp_factory = smtp_factory
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._smtp = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.connects = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="mail-worker", daemon=True)
+            self._thread.start()
+
+    def submit(self, user_email, user_message):
+        """Enqueue one contact-form message; False if the queue is full."""
+        self.start()
+        msg = build_message(self.sender_email, self.receiver_email, user_email, user_message)
+        try:
+            self._queue.put_nowait(msg)
+        except queue.Full:
+            return False
+        return True
+
+    def join(self):
+        """Block until every queued message was delivered or given up on."""
+        self._queue.join()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            try:
+                msg = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                self._disconnect()
+                continue
+            try:
+                with metrics.span("smtp_deliver"):
+                    self._deliver(msg)
+            finally:
+                self._queue.task_done()
+
+    def _connection(self):
+        if self._smtp is None:
+            smtp = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.starttls:
+                    smtp.starttls(context=ssl.create_default_context())
+                if self.sender_password:
+                    smtp.login(self.sender_email, self.sender_password)
+            except BaseException:
+                smtp.close()
+                raise
+            self._smtp = smtp
+            self.connects += 1
+        return self._smtp
+
+    def _disconnect(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+    def _deliver(self, msg):
+        text = msg.as_string()
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._connection().sendmail(self.sender_email, [self.receiver_email], text)
+                self.sent += 1
+                return True
+            except (smtplib.SMTPException, OSError) as e:
+                # Any error may leave the session in an unknown state.
+                self._disconnect()
+                if not _is_transient(e) or attempt == self.max_retries:
+                    self.failed += 1
+                    return False
+                self.retries += 1
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def stats(self):
+        return {
+            "pending": self.pending(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "connects": self.connects,
+        }
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_mail_queue(sender_email, sender_password, receiver_email, **options):
+    """Process-wide MailQueue for one set of credentials."""
+    key = (sender_email, receiver_email, options.get("host", SMTP_HOST), options.get("port", SMTP_PORT))
+    with _queues_lock:
+        mail_queue = _queues.get(key)
+        if mail_queue is None:
+            mail_queue = _queues[key] = MailQueue(sender_email, sender_password, receiver_email, **options)
+        return mail_queue
@@ -0,0 +1,274 @@
+import threading
+import time
+
+import pandas as pd
+import yfinance as yf
+
+from cache import TTLCache
+from metrics import metrics
+from ohlc_store import OHLCStore
+from shared_state import SharedCache
+
+# Objects in this module live for the whole Streamlit process, so every
+# session (and every rerun) shares them. app.py itself is re-executed on each
+# rerun and must not hold anything that should survive between reruns.
+
+HISTORY_TTL = 60                      # seconds a fetched history stays fresh
+HISTORY_MAX_BYTES = 64 * 1024 * 1024  # memory cap for cached frames
+
+ASSET_PAIRS = {
+    "Bitcoin (BTC-USD)": "BTC-USD",
+    "Ethereum (ETH-USD)": "ETH-USD",
+    "Solana (SOL-USD)": "SOL-USD",
+    "Cardano (ADA-USD)": "ADA-USD",
+    "Ripple (XRP-USD)": "XRP-USD",
+    "Dogecoin (DOGE-USD)": "DOGE-USD",
+}
+TIMEFRAMES = ["1mo", "3mo", "6mo", "1y", "ytd"]
+
+# Intraday bars all come from one 1m fetch per symbol (Yahoo keeps 7 days of
+# 1m data); coarser intervals are resampled locally.
+INTERVALS = ["1m", "5m", "15m", "1h", "1d"]
+INTRADAY_TIMEFRAMES = ["1d", "5d", "7d"]
+INTRADAY_BASE_INTERVAL = "1m"
+INTRADAY_BASE_PERIOD = "7d"
+RESAMPLE_RULES = {"5m": "5min", "15m": "15min", "1h": "1h"}
+BAR_RULES = {"1m": "1min", **RESAMPLE_RULES, "1d": "1D"}
+OHLC_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+PREFETCH_PERIOD = "1y"    # longest configured timeframe; "ytd" never exceeds it
+PREFETCH_INTERVAL = 60    # seconds between batched refreshes
+
+
+history_cache = TTLCache(ttl=HISTORY_TTL, max_bytes=HISTORY_MAX_BYTES)
+# Behind the per-process caches: one Yahoo request per key across all workers.
+history_shared = SharedCache("history", ttl=HISTORY_TTL)
+prefetch_shared = SharedCache("prefetch", ttl=PREFETCH_INTERVAL)
+
+
+# --- BATCH PREFETCH ---
+def slice_period(df, period):
+    """Cut a trailing `period` window out of a longer daily frame."""
+    if df.empty:
+        return df
+    end = df.index[-1]
+    if period == "ytd":
+        # Unlike the trailing windows, the year's first bar is part of it.
+        return df.loc[df.index >= end.normalize().replace(month=1, day=1)]
+    if period.endswith("mo"):
+        start = end - pd.DateOffset(months=int(period[:-2]))
+    elif period.endswith("y"):
+        start = end - pd.DateOffset(years=int(period[:-1]))
+    elif period.endswith("d"):
+        start = end - pd.Timedelta(days=int(period[:-1]))
+    else:
+        raise ValueError(f"Unsupported period: {period}")
+    return df.loc[df.index > start]
+
+
+def stack_frames(frames):
+    """{symbol: frame} as one frame with a leading `Symbol` index level."""
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, names=["Symbol"])
+
+
+def unstack_frames(stacked):
+    if stacked.empty:
+        return {}
+    return {symbol: df.droplevel("Symbol") for symbol, df in stacked.groupby(level="Symbol", sort=False)}
+
+
+class Prefetcher:
+    """Keeps every listed pair warm with one multi-ticker download.
+
+    A daemon thread refreshes all symbols on a schedule; shorter timeframes
+    are sliced out of the in-memory frame so switching assets or timeframes
+    never touches the network. With a store attached, refreshes only ask
+    Yahoo for bars newer than the ones already on disk, and a cold start
+    serves the stored bars before the first refresh completes. With a
+    shared cache attached, one worker per interval does the refresh and the
+    others take its frames from the cache.
+    """
+
+    def __init__(self, symbols, store=None, period=PREFETCH_PERIOD, interval=PREFETCH_INTERVAL, shared=None):
+        self.symbols = list(symbols)
+        self.store = store
+        self.shared = shared
+        self.period = period
+        self.interval = interval
+        self._frames = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.refreshes = 0
+        self.failures = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self.store is not None and not self._frames:
+                self._publish(self._load_stored())
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="market-prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                self.failures += 1
+            self._stop.wait(self.interval)
+
+    def _download(self, **window):
+        with metrics.span("yahoo_download"):
+            raw = yf.download(
+                self.symbols,
+                interval="1d",
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+                **window,
+            )
+        frames = {}
+        for symbol in self.symbols:
+            if symbol not in raw.columns.get_level_values(0):
+                continue
+            df = raw[symbol].dropna(how="all")
+            if not df.empty:
+                frames[symbol] = df
+        return frames
+
+    def _load_stored(self):
+        cutoff = pd.Timestamp.now(tz="UTC") - pd.DateOffset(years=1, days=7)
+        frames = {}
+        for symbol in self.symbols:
+            df = self.store.load(symbol, "1d", start=cutoff)
+            if not df.empty:
+                frames[symbol] = df
+        return frames
+
+    def refresh(self):
+        if self.shared is None:
+            frames = self._refresh_frames()
+        else:
+            stacked = self.shared.get_or_fetch(tuple(self.symbols),
+                                               lambda: stack_frames(self._refresh_frames()))
+            frames = unstack_frames(stacked)
+        if not frames:
+            raise RuntimeError("Batched download returned no data")
+        self._publish(frames)
+        self.refreshes += 1
+
+    def _refresh_frames(self):
+        if self.store is None:
+            return self._download(period=self.period)
+        last = [self.store.last_timestamp(symbol, "1d") for symbol in self.symbols]
+        if all(ts is not None for ts in last):
+            # Start at the oldest "latest bar" so the still-forming bar
+            # of every symbol is re-fetched and replaced.
+            delta = self._download(start=min(last).strftime("%Y-%m-%d"))
+        else:
+            delta = self._download(period=self.period)
+        for symbol, df in delta.items():
+            self.store.upsert(symbol, "1d", df)
+        return self._load_stored()
+
+    def _publish(self, frames):
+        if not frames:
+            return
+        # Swap the whole dict so readers never see a half-updated snapshot.
+        self._frames = frames
+        self._fetched_at = time.monotonic()
+
+    def is_fresh(self):
+        # Tolerate a couple of missed refreshes before falling back.
+        return bool(self._frames) and time.monotonic() - self._fetched_at < 3 * self.interval
+
+    def get(self, symbol, period):
+        if not self.is_fresh():
+            return None
+        df = self._frames.get(symbol)
+        if df is None:
+            return None
+        return slice_period(df, period)
+
+
+prefetcher = Prefetcher(ASSET_PAIRS.values(), store=OHLCStore(), shared=prefetch_shared)
+
+
+def start_prefetcher():
+    prefetcher.start()
+
+
+# --- HISTORY FETCH ---
+def _fetch_history(symbol, period, interval):
+    with metrics.span("yahoo_history"):
+        return yf.Ticker(symbol).history(period=period, interval=interval)
+
+
+def _cached_history(symbol, period, interval):
+    # Shared frame straight from the cache; callers must not mutate it.
+    return history_cache.get_or_fetch(
+        (symbol, period, interval),
+        lambda: history_shared.get_or_fetch((symbol, period, interval),
+                                            lambda: _fetch_history(symbol, period, interval)),
+    )
+
+
+def get_history(symbol, period, interval="1d"):
+    if interval == "1d" and period in TIMEFRAMES:
+        df = prefetcher.get(symbol, period)
+        if df is not None:
+            return df.copy()
+    # Callers add indicator columns in place; keep the shared frame pristine.
+    return _cached_history(symbol, period, interval).copy()
+
+
+# --- INTRADAY RESAMPLING ---
+def resample_ohlc(df, rule):
+    """Aggregate bars to a coarser interval: OHLC first/max/min/last, volume sum."""
+    agg = {column: how for column, how in OHLC_AGG.items() if column in df.columns}
+    return df.resample(rule, label="left", closed="left").agg(agg).dropna(subset=["Close"])
+
+
+def get_bars(symbol, timeframe, interval="1d"):
+    """Bars for the chart: daily history, or intraday cut from the 1m base."""
+    if interval == "1d":
+        return get_history(symbol, timeframe)
+    base = _cached_history(symbol, INTRADAY_BASE_PERIOD, INTRADAY_BASE_INTERVAL)
+    if interval in RESAMPLE_RULES:
+        base = resample_ohlc(base, RESAMPLE_RULES[interval])
+    # Boolean slicing returns a new frame, so the cached base stays untouched.
+    return slice_period(base, timeframe)
+
+
+def rolling_24h_range(symbol):
+    """(high, low) over the trailing 24 hours, or None without intraday data.
+
+    Reads the 1m base, so on a cold cache this is a per-symbol Yahoo fetch;
+    only call it where an intraday chart needs that base anyway.
+    """
+    base = _cached_history(symbol, INTRADAY_BASE_PERIOD, INTRADAY_BASE_INTERVAL)
+    if base.empty:
+        return None
+    window = base.loc[base.index > base.index[-1] - pd.Timedelta(hours=24)]
+    return float(window["High"].max()), float(window["Low"].min())
+
+
+def close_matrix(period=PREFETCH_PERIOD, symbols=None):
+    """Aligned (time x symbol) close prices for the prefetched pairs."""
+    symbols = list(symbols or ASSET_PAIRS.values())
+    closes = {symbol: get_history(symbol, period)["Close"] for symbol in symbols}
+    return pd.DataFrame(closes).sort_index()
+
+
+def cache_stats():
+    return history_cache.stats()
@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Timing spans for the hot paths. Every span feeds a process-wide histogram;
+# spans on a script thread between begin_rerun() and end_rerun() also make up
+# that rerun's breakdown. Background workers (prefetcher, news poller, mail
+# worker, AI gateway) record into the histograms only.
+
+SPAN_SAMPLES = 2048      # recent durations kept per span for percentiles
+RECENT_RERUNS = 200      # rerun breakdowns kept for the admin panel
+SLOW_RERUN = 1.0         # seconds; slower reruns are logged with their breakdown
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX = "academy"
+
+log = logging.getLogger(__name__)
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Histogram:
+    """Cumulative Prometheus buckets plus a window of recent samples."""
+
+    def __init__(self, buckets=BUCKETS, samples=SPAN_SAMPLES):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+        self._samples = deque(maxlen=samples)
+
+    def observe(self, seconds, error=False):
+        self.count += 1
+        self.sum += seconds
+        self.errors += error
+        self._samples.append(seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    def summary(self):
+        samples = list(self._samples)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total": self.sum,
+            "p50": percentile(samples, 0.50),
+            "p95": percentile(samples, 0.95),
+            "p99": percentile(samples, 0.99),
+            "max": max(samples, default=0.0),
+        }
+
+
+class RerunTrace:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.spans = {}
+        self.total = None
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def finish(self):
+        self.total = time.perf_counter() - self._start
+        return self
+
+    def as_dict(self):
+        return {"page": self.page, "started": self.started, "total": self.total, "spans": dict(self.spans)}
+
+
+class MetricsRegistry:
+    def __init__(self, recent=RECENT_RERUNS, slow_rerun=SLOW_RERUN):
+        self.slow_rerun = slow_rerun
+        self._histograms = {}
+        self._recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram())
+        return histogram
+
+    def observe(self, name, seconds, error=False):
+        histogram = self._histogram(name)
+        with self._lock:
+            histogram.observe(seconds, error)
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace.add(name, seconds)
+
+    @contextmanager
+    def span(self, name):
+        """Time the block under `name`; exceptions are counted and re-raised."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, error)
+
+    def begin_rerun(self, page):
+        self._local.trace = RerunTrace(page)
+
+    def end_rerun(self):
+        """Close this thread's rerun; returns its breakdown (or None)."""
+        trace = getattr(self._local, "trace", None)
+        if trace is None:
+            return None
+        self._local.trace = None
+        record = trace.finish().as_dict()
+        self.observe("rerun", record["total"])
+        with self._lock:
+            self._recent.append(record)
+        if record["total"] > self.slow_rerun:
+            breakdown = " ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in record["spans"].items())
+            log.warning("slow rerun page=%s total=%.0fms %s", record["page"], record["total"] * 1000, breakdown)
+        return record
+
+    def summary(self):
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def recent_reruns(self):
+        with self._lock:
+            return list(self._recent)
+
+    def prometheus_text(self):
+        """All spans in the Prometheus text exposition format."""
+        name = f"{METRIC_PREFIX}_span_seconds"
+        histograms = [f"# HELP {name} Duration of instrumented hot paths.", f"# TYPE {name} histogram"]
+        recent = [f"# HELP {name}_recent Percentiles over the last {SPAN_SAMPLES} samples.",
+                  f"# TYPE {name}_recent gauge"]
+        errors = [f"# HELP {METRIC_PREFIX}_span_errors_total Spans that ended in an exception.",
+                  f"# TYPE {METRIC_PREFIX}_span_errors_total counter"]
+        with self._lock:
+            for span, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    histograms.append(f'{name}_bucket{{span="{span}",le="{bound}"}} {cumulative}')
+                histograms.append(f'{name}_bucket{{span="{span}",le="+Inf"}} {histogram.count}')
+                histograms.append(f'{name}_sum{{span="{span}"}} {histogram.sum}')
+                histograms.append(f'{name}_count{{span="{span}"}} {histogram.count}')
+                summary = histogram.summary()
+                for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                    recent.append(f'{name}_recent{{span="{span}",quantile="{quantile}"}} {summary[key]}')
+                errors.append(f'{METRIC_PREFIX}_span_errors_total{{span="{span}"}} {histogram.errors}')
+        return "\n".join(histograms + recent + errors) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+# --- PROMETHEUS ENDPOINT ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_error = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve /metrics on a side port, once per process.
+
+    A failed bind (the port is taken, e.g. by another worker on the same
+    host) is logged once and never retried; the app runs on without the
+    endpoint and this returns None.
+    """
+    global _server, _server_error
+    with _server_lock:
+        if _server is None and _server_error is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                _server_error = e
+                log.warning("metrics endpoint disabled, cannot bind %s:%s: %s", host, port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
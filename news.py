@@ -0,0 +1,277 @@
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import metrics
+from shared_state import SharedCache
+
+# A single background poller per process keeps the parsed headlines in
+# memory; the news tab only ever reads that list and never waits on a feed.
+
+NEWS_LIMIT = 20           # merged headlines kept for the news tab
+NEWS_PER_SOURCE = 10      # items taken from each feed
+NEWS_POLL_INTERVAL = 300  # seconds between polls
+NEWS_TIMEOUT = 5          # per-source timeout
+NEWS_CHUNK_SIZE = 16 * 1024
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+class FeedSource:
+    """One RSS/Atom feed plus the validators from its last response."""
+
+    def __init__(self, name, url, timeout=NEWS_TIMEOUT):
+        self.name = name
+        self.url = url
+        self.timeout = timeout
+        self.etag = None
+        self.last_modified = None
+
+    def __repr__(self):
+        return f"FeedSource({self.name!r}, {self.url!r})"
+
+
+NEWS_SOURCES = [
+    FeedSource("Cointelegraph", "https://cointelegraph.com/rss"),
+    FeedSource("CoinDesk", "https://www.coindesk.com/arc/outboundfeeds/rss/"),
+    FeedSource("Decrypt", "https://decrypt.co/feed"),
+]
+
+
+def _timestamp(item):
+    try:
+        return parsedate_to_datetime(item['pubDate']).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _text(node, tag):
+    child = node.find(tag)
+    return child.text.strip() if child is not None and child.text else ""
+
+
+def canonical_link(link):
+    parts = urlsplit(link.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower().removeprefix("www."), path, "", ""))
+
+
+def dedup_key(item):
+    if item['link']:
+        return canonical_link(item['link'])
+    title = " ".join(item['title'].lower().split())
+    return "title:" + hashlib.sha1(title.encode("utf-8")).hexdigest()
+
+
+# --- RSS / ATOM PARSING ---
+def _atom_date(value):
+    try:
+        return format_datetime(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        return value
+
+
+def _item_from_element(node, source):
+    if node.tag == _ATOM + "entry":
+        link = node.find(_ATOM + "link")
+        return {
+            'title': _text(node, _ATOM + "title"),
+            'link': link.get("href", "") if link is not None else "",
+            'pubDate': _atom_date(_text(node, _ATOM + "updated") or _text(node, _ATOM + "published")),
+            'source': source,
+        }
+    return {
+        'title': _text(node, 'title'),
+        'link': _text(node, 'link'),
+        'pubDate': _text(node, 'pubDate'),
+        'source': source,
+    }
+
+
+def parse_feed(content, source, limit=NEWS_PER_SOURCE):
+    """Normalize an RSS or Atom document to the news tab's item dicts."""
+    root = ET.fromstring(content)
+    if root.tag == _ATOM + "feed":
+        nodes = root.findall(_ATOM + "entry")
+    else:
+        nodes = root.findall('./channel/item')
+    return [_item_from_element(node, source) for node in nodes[:limit]]
+
+
+def parse_feed_stream(chunks, source, limit=NEWS_PER_SOURCE):
+    """Incremental variant of parse_feed over an iterable of byte chunks.
+
+    Stops consuming `chunks` as soon as `limit` items are collected and
+    clears each item once converted, so neither the body nor the tree is
+    held in memory.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    news_items = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, node in parser.read_events():
+            if node.tag in ("item", _ATOM + "entry"):
+                news_items.append(_item_from_element(node, source))
+                node.clear()
+                if len(news_items) >= limit:
+                    return news_items
+    parser.close()
+    return news_items
+
+
+def merge_news(*lists, limit=NEWS_LIMIT):
+    """Deduplicate by canonical link (or title hash) and sort newest first."""
+    merged = {}
+    for items in lists:
+        for item in items:
+            merged[dedup_key(item)] = item
+    return sorted(merged.values(), key=_timestamp, reverse=True)[:limit]
+
+
+class NewsService:
+    """Polls every source concurrently on an interval using conditional GETs.
+
+    Sources share one pooled session. Each request carries its source's own
+    timeout, and a poll never waits longer than the slowest timeout; feeds
+    that miss it are skipped until the next round. ETag / Last-Modified
+    validators are sent back so an unchanged feed costs a 304 and no parsing.
+    In streaming mode the body is parsed as it arrives and the connection is
+    dropped once enough items are read. With a shared cache attached, one
+    worker per interval polls and the others merge its headlines.
+    """
+
+    def __init__(self, sources=NEWS_SOURCES, limit=NEWS_LIMIT, per_source=NEWS_PER_SOURCE,
+                 interval=NEWS_POLL_INTERVAL, session=None, streaming=True, shared=None):
+        self.sources = list(sources)
+        self.shared = shared
+        self.streaming = streaming
+        self.limit = limit
+        self.per_source = per_source
+        self.interval = interval
+        self.session = session or self._pooled_session(len(self.sources))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.sources)), thread_name_prefix="news-fetch")
+        self._items = []
+        self._lock = threading.Lock()
+        self._merge_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.fetches = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    @staticmethod
+    def _pooled_session(size):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(1, size), pool_maxsize=max(1, size))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="news-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                self.failures += 1
+            self._stop.wait(self.interval)
+
+    def fetch_source(self, source):
+        """Return parsed items, or None when the feed answered 304."""
+        headers = {}
+        if source.etag:
+            headers['If-None-Match'] = source.etag
+        if source.last_modified:
+            headers['If-Modified-Since'] = source.last_modified
+        response = self.session.get(source.url, headers=headers, timeout=source.timeout,
+                                    stream=self.streaming)
+        self.fetches += 1
+        try:
+            if response.status_code == 304:
+                self.not_modified += 1
+                return None
+            response.raise_for_status()
+            if self.streaming:
+                chunks = response.iter_content(chunk_size=NEWS_CHUNK_SIZE)
+                items = parse_feed_stream(chunks, source.name, self.per_source)
+            else:
+                items = parse_feed(response.content, source.name, self.per_source)
+        finally:
+            # Releases the connection even if the body was only partly read.
+            response.close()
+        source.etag = response.headers.get('ETag')
+        source.last_modified = response.headers.get('Last-Modified')
+        return items
+
+    def _result(self, future):
+        try:
+            return future.result()
+        except Exception:
+            self.failures += 1
+            return None
+
+    def _publish(self, lists):
+        # Readers grab the list reference without locking; publish a new list.
+        with self._merge_lock:
+            self._items = merge_news(self._items, *lists, limit=self.limit)
+
+    def _publish_late(self, future):
+        # The source's validators are already updated, so its items must not
+        # be dropped just because they missed this round's deadline.
+        items = self._result(future)
+        if items:
+            self._publish([items])
+
+    def poll(self):
+        with metrics.span("news_poll"):
+            futures = [self._executor.submit(self.fetch_source, source) for source in self.sources]
+            done, pending = wait(futures, timeout=max(source.timeout for source in self.sources))
+            self.timeouts += len(pending)
+            for future in pending:
+                future.add_done_callback(self._publish_late)
+            fresh = [items for items in map(self._result, done) if items]
+            if fresh:
+                self._publish(fresh)
+        return bool(fresh)
+
+    def _poll_items(self):
+        self.poll()
+        return self.items()
+
+    def refresh(self):
+        if self.shared is None:
+            return self.poll()
+        items = self.shared.get_or_fetch("headlines", self._poll_items)
+        if items:
+            self._publish([items])
+        return bool(items)
+
+    def items(self):
+        return list(self._items)
+
+
+news_service = NewsService(shared=SharedCache("news", ttl=NEWS_POLL_INTERVAL))
+
+
+# --- NEWS FETCHING FUNCTION (RSS) ---
+def get_crypto_news():
+    news_service.start()
+    return news_service.items()
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+# On-disk OHLC bars, one row per (symbol, interval, bar timestamp). The
+# prefetcher only downloads bars newer than what is stored here, and a cold
+# restart of the server serves charts from disk before the first refresh.
+
+OHLC_DB_PATH = os.environ.get(
+    "OHLC_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ohlc.sqlite3"),
+)
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ohlc (
+    symbol   TEXT    NOT NULL,
+    interval TEXT    NOT NULL,
+    ts       INTEGER NOT NULL,
+    open     REAL,
+    high     REAL,
+    low      REAL,
+    close    REAL,
+    volume   REAL,
+    PRIMARY KEY (symbol, interval, ts)
+) WITHOUT ROWID
+"""
+
+_EPOCH = pd.Timestamp(0, tz="UTC")
+
+
+def _to_utc_index(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        return index.tz_localize("UTC")
+    return index.tz_convert("UTC")
+
+
+class OHLCStore:
+    def __init__(self, path=OHLC_DB_PATH):
+        self.path = path
+        self._write_lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Short-lived connections keep this safe to call from any thread.
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def last_timestamp(self, symbol, interval="1d"):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(ts) FROM ohlc WHERE symbol = ? AND interval = ?",
+                (symbol, interval),
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return pd.Timestamp(row[0], unit="s", tz="UTC")
+
+    def upsert(self, symbol, interval, df):
+        """Merge bars into the store; newer rows replace same-timestamp ones.
+
+        The latest bar is still forming while its period is open, so a delta
+        fetch always re-requests it and overwrites the stored copy.
+        """
+        if df is None or df.empty:
+            return 0
+        df = df[COLUMNS].dropna(subset=["Close"])
+        ts = (_to_utc_index(df.index) - _EPOCH) // pd.Timedelta(seconds=1)
+        rows = [
+            (symbol, interval, int(t), *map(float, values))
+            for t, values in zip(ts, df.itertuples(index=False, name=None))
+        ]
+        with self._write_lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ohlc VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def load(self, symbol, interval="1d", start=None):
+        query = "SELECT ts, open, high, low, close, volume FROM ohlc WHERE symbol = ? AND interval = ?"
+        params = [symbol, interval]
+        if start is not None:
+            query += " AND ts >= ?"
+            start = _to_utc_index([start])[0]
+            params.append(int((start - _EPOCH) // pd.Timedelta(seconds=1)))
+        query += " ORDER BY ts"
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        if not rows:
+            return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], tz="UTC", name="Date"))
+        df = pd.DataFrame(rows, columns=["ts"] + COLUMNS)
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.pop("ts"), unit="s", utc=True), name="Date")
+        return df
+
+    def symbols(self, interval="1d"):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT symbol FROM ohlc WHERE interval = ?", (interval,)
+            ).fetchall()
+        return [r[0] for r in rows]
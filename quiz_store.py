@@ -0,0 +1,232 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from metrics import metrics
+
+# Quiz scoring and the attempt log. Submitting the form only enqueues the
+# attempt; one writer thread per process appends queued attempts in batches
+# to SQLite and, in the same transaction, adds them to per-question, per-option
+# and per-score counters. Analytics read those counters, never the log.
+
+QUIZ_DB_PATH = os.environ.get(
+    "QUIZ_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "quiz.sqlite3"),
+)
+QUIZ_BATCH_SIZE = 256       # attempts written per transaction at most
+QUIZ_FLUSH_INTERVAL = 2.0   # seconds a partial batch waits for company
+QUIZ_QUEUE_SIZE = 10_000
+UNANSWERED = -1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id      INTEGER PRIMARY KEY,
+    ts      REAL    NOT NULL,
+    score   INTEGER NOT NULL,
+    total   INTEGER NOT NULL,
+    answers TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS question_stats (
+    question_id TEXT PRIMARY KEY,
+    attempts    INTEGER NOT NULL,
+    correct     INTEGER NOT NULL,
+    unanswered  INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS option_stats (
+    question_id TEXT    NOT NULL,
+    option      INTEGER NOT NULL,
+    picks       INTEGER NOT NULL,
+    PRIMARY KEY (question_id, option)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS score_stats (
+    score    INTEGER PRIMARY KEY,
+    attempts INTEGER NOT NULL
+);
+"""
+
+
+# --- SCORING ---
+def questions(quiz):
+    return [question for part in quiz["parts"] for question in part["questions"]]
+
+
+def answer_key(quiz):
+    """(question ids, correct option index per question)."""
+    qs = questions(quiz)
+    return [q["id"] for q in qs], np.array([q["answer"] for q in qs])
+
+
+def choice_indices(quiz, choices):
+    """Selected option labels (None if skipped) to option indices."""
+    return np.array([q["options"].index(c) if c is not None else UNANSWERED
+                     for q, c in zip(questions(quiz), choices)])
+
+
+def score_attempts(choices, key):
+    """Correctness and score for a batch of attempts in one comparison.
+
+    `choices` is (attempt x question) or a single attempt's row of option
+    indices; returns (correct, scores) with matching leading shape.
+    """
+    correct = np.asarray(choices) == key
+    return correct, correct.sum(axis=-1)
+
+
+# --- ATTEMPT STORE ---
+class AttemptStore:
+    """Append-only attempt log fed by a bounded queue and one writer thread.
+
+    Each batch lands in a single transaction together with its increments to
+    the aggregate tables, so the counters always match the log.
+    """
+
+    def __init__(self, path=QUIZ_DB_PATH, batch_size=QUIZ_BATCH_SIZE, flush_interval=QUIZ_FLUSH_INTERVAL,
+                 maxsize=QUIZ_QUEUE_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="quiz-writer", daemon=True)
+            self._thread.start()
+
+    def record(self, question_ids, choices, correct):
+        """Enqueue one scored attempt; False (and counted) if the queue is full."""
+        self.start()
+        attempt = (time.time(), tuple(question_ids), np.asarray(choices, dtype=np.int64),
+                   np.asarray(correct, dtype=bool))
+        try:
+            self._queue.put_nowait(attempt)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def join(self):
+        """Block until every queued attempt was written or given up on."""
+        self._queue.join()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                with metrics.span("quiz_write"):
+                    self._write(batch)
+            except Exception:
+                self.failed += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        rows, question_rows, option_rows, score_rows = [], [], [], []
+        # Attempts made against the same question list aggregate as one matrix.
+        groups = {}
+        for ts, ids, choices, correct in batch:
+            groups.setdefault(ids, []).append((ts, choices, correct))
+        for ids, attempts in groups.items():
+            choices = np.stack([a[1] for a in attempts])
+            correct = np.stack([a[2] for a in attempts])
+            scores = correct.sum(axis=1)
+            for (ts, _, _), row, score in zip(attempts, choices, scores):
+                rows.append((ts, int(score), len(ids), json.dumps(dict(zip(ids, row.tolist())))))
+            answered = choices != UNANSWERED
+            for q, question_id in enumerate(ids):
+                question_rows.append((question_id, len(attempts), int(correct[:, q].sum()),
+                                      int((~answered[:, q]).sum())))
+                picks = np.bincount(choices[answered[:, q], q])
+                option_rows.extend((question_id, option, int(n)) for option, n in enumerate(picks) if n)
+            score_rows.extend((score, int(n)) for score, n in enumerate(np.bincount(scores)) if n)
+        with self._connect() as conn:
+            conn.executemany("INSERT INTO attempts (ts, score, total, answers) VALUES (?, ?, ?, ?)", rows)
+            conn.executemany(
+                "INSERT INTO question_stats VALUES (?, ?, ?, ?) ON CONFLICT (question_id) DO UPDATE SET "
+                "attempts = attempts + excluded.attempts, correct = correct + excluded.correct, "
+                "unanswered = unanswered + excluded.unanswered", question_rows)
+            conn.executemany(
+                "INSERT INTO option_stats VALUES (?, ?, ?) ON CONFLICT (question_id, option) DO UPDATE SET "
+                "picks = picks + excluded.picks", option_rows)
+            conn.executemany(
+                "INSERT INTO score_stats VALUES (?, ?) ON CONFLICT (score) DO UPDATE SET "
+                "attempts = attempts + excluded.attempts", score_rows)
+        self.written += len(rows)
+        self.batches += 1
+
+    # --- ANALYTICS (aggregates only) ---
+    def question_stats(self):
+        with self._connect() as conn:
+            totals = pd.read_sql_query("SELECT * FROM question_stats", conn, index_col="question_id")
+            options = pd.read_sql_query("SELECT * FROM option_stats", conn)
+        return totals, options
+
+    def score_distribution(self):
+        with self._connect() as conn:
+            return pd.read_sql_query("SELECT * FROM score_stats ORDER BY score", conn, index_col="score")["attempts"]
+
+    def stats(self):
+        return {"pending": self.pending(), "written": self.written, "batches": self.batches,
+                "dropped": self.dropped, "failed": self.failed}
+
+
+def question_report(quiz, store):
+    """Per-question error rates and the most picked wrong answer, hardest first."""
+    totals, options = store.question_stats()
+    rows = []
+    for q in questions(quiz):
+        if q["id"] not in totals.index:
+            continue
+        t = totals.loc[q["id"]]
+        wrong = options[(options["question_id"] == q["id"]) & (options["option"] != q["answer"])]
+        top = wrong.loc[wrong["picks"].idxmax()] if not wrong.empty else None
+        rows.append({
+            "question": q["text"],
+            "attempts": int(t["attempts"]),
+            "error_rate": 1 - t["correct"] / t["attempts"],
+            "skipped": t["unanswered"] / t["attempts"],
+            "top_wrong_answer": q["options"][int(top["option"])] if top is not None else "",
+        })
+    report = pd.DataFrame(rows, columns=["question", "attempts", "error_rate", "skipped", "top_wrong_answer"])
+    return report.sort_values("error_rate", ascending=False, ignore_index=True)
+
+
+attempt_store = AttemptStore()
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+
+# A cache tier shared by every worker process behind the load balancer. The
+# per-process caches (TTLCache, the prefetcher, the news poller) stay in
+# front; on a local miss they ask the shared tier, and only one worker at a
+# time goes upstream for a given key while the others wait for its result.
+#
+# The backend is picked with SHARED_STATE_URL: unset means no shared tier
+# (a single process, as before), "memory://" an in-process store, and
+# "redis://host:port/db" any Redis-compatible server. RedisBackend takes any
+# client with the redis-py interface (`pip install redis`), so tests can hand
+# it fakeredis.
+
+SHARED_STATE_URL = os.environ.get("SHARED_STATE_URL", "")
+SHARED_TIMEOUT = 2.0     # seconds per backend round trip
+SHARED_LOCK_TTL = 30.0   # an upstream fetch holding a key's lock longer is presumed dead
+SHARED_POLL = 0.05       # seconds between checks while another worker fetches
+FORMAT_VERSION = 1       # bump when the encoding of any cached value changes
+
+
+# --- BACKENDS ---
+class LocalBackend:
+    """In-process store with the same semantics as the Redis backend."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._data = {}   # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= self._clock():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[1] if entry is not None else None
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (self._clock() + ttl if ttl else None, value)
+
+    def add(self, key, value, ttl=None):
+        """Set `key` only if it is absent; True if this call set it."""
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._data[key] = (self._clock() + ttl if ttl else None, value)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._live(key)
+            value = int(entry[1]) + 1 if entry is not None else 1
+            self._data[key] = (entry[0] if entry is not None else None, str(value).encode())
+            return value
+
+
+class RedisBackend:
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url, timeout=SHARED_TIMEOUT):
+        # Imported here: only multi-worker deployments need the client.
+        import redis
+        return cls(redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout))
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self.client.set(key, value, px=int(ttl * 1000) if ttl else None, nx=True))
+
+    def delete(self, key):
+        self.client.delete(key)
+
+    def incr(self, key):
+        return int(self.client.incr(key))
+
+
+def backend_from_url(url):
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return LocalBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend.from_url(url)
+    raise ValueError(f"unsupported SHARED_STATE_URL: {url!r}")
+
+
+# --- SERIALIZATION ---
+# pandas and pyarrow are only imported where a frame is involved: the chat
+# and news caches hold JSON and must not pay for loading them. A value can
+# only be a DataFrame if something already imported pandas.
+def _is_frame(value):
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(value, pd.DataFrame)
+
+
+def encode(value):
+    """DataFrames as compressed Arrow IPC, everything else as compressed JSON."""
+    if _is_frame(value):
+        import pyarrow as pa
+        table = pa.Table.from_pandas(value, preserve_index=True)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return b"A" + sink.getvalue().to_pybytes()
+    return b"J" + zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+
+def decode(blob):
+    kind, body = blob[:1], blob[1:]
+    if kind == b"A":
+        import pyarrow as pa
+        return pa.ipc.open_stream(body).read_all().to_pandas()
+    if kind == b"J":
+        return json.loads(zlib.decompress(body))
+    raise ValueError(f"unknown shared value encoding: {kind!r}")
+
+
+def _storable(value):
+    # Empty frames usually mean Yahoo throttled us; don't share them either.
+    if _is_frame(value):
+        return not value.empty
+    return value is not None and value != [] and value != ""
+
+
+shared_backend = backend_from_url(SHARED_STATE_URL)
+_caches = []
+
+
+# --- SHARED CACHE ---
+class SharedCache:
+    """One namespace of the shared tier.
+
+    Keys are stored as `<namespace>:<format>:<generation>:<digest>`.
+    `invalidate()` bumps the namespace's generation counter on the backend,
+    so every worker stops seeing the old entries at once; they are never
+    deleted one by one and simply expire. With no backend every call goes
+    straight to `fetch`. Backend errors are counted and fall back to
+    `fetch` too, so a down Redis degrades to per-worker fetching.
+    """
+
+    def __init__(self, namespace, ttl, backend=None, lock_ttl=SHARED_LOCK_TTL, poll=SHARED_POLL):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.backend = backend if backend is not None else shared_backend
+        self.lock_ttl = lock_ttl
+        self.poll = poll
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.fetches = 0
+        self.errors = 0
+        _caches.append(self)
+
+    def _generation(self):
+        value = self.backend.get(f"{self.namespace}:generation")
+        return int(value) if value is not None else 0
+
+    def _key(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{FORMAT_VERSION}:{self._generation()}:{digest}"
+
+    def get(self, key):
+        """Shared value for `key`, or None; never fetches."""
+        if self.backend is None:
+            return None
+        try:
+            blob = self.backend.get(self._key(key))
+        except Exception:
+            self.errors += 1
+            return None
+        if blob is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return decode(blob)
+
+    def put(self, key, value):
+        if self.backend is None or not _storable(value):
+            return
+        try:
+            self.backend.set(self._key(key), encode(value), self.ttl)
+        except Exception:
+            self.errors += 1
+
+    def get_or_fetch(self, key, fetch):
+        if self.backend is None:
+            return fetch()
+        try:
+            full_key = self._key(key)
+            blob = self.backend.get(full_key)
+            if blob is not None:
+                self.hits += 1
+                return decode(blob)
+            self.misses += 1
+            owner = self.backend.add(full_key + ":lock", b"1", self.lock_ttl)
+        except Exception:
+            self.errors += 1
+            return fetch()
+        if owner:
+            return self._fetch_and_share(full_key, fetch)
+        # Another worker is fetching; wait for its result rather than going
+        # upstream too. If its lock goes away without a value, fetch here.
+        self.waits += 1
+        deadline = time.monotonic() + self.lock_ttl
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(self.poll)
+                blob = self.backend.get(full_key)
+                if blob is not None:
+                    return decode(blob)
+                if self.backend.get(full_key + ":lock") is None:
+                    break
+        except Exception:
+            self.errors += 1
+        self.fetches += 1
+        return fetch()
+
+    def _fetch_and_share(self, full_key, fetch):
+        self.fetches += 1
+        try:
+            value = fetch()
+            if _storable(value):
+                try:
+                    self.backend.set(full_key, encode(value), self.ttl)
+                except Exception:
+                    self.errors += 1
+            return value
+        finally:
+            try:
+                self.backend.delete(full_key + ":lock")
+            except Exception:
+                self.errors += 1
+
+    def invalidate(self):
+        """Retire every entry in the namespace, on every worker."""
+        if self.backend is None:
+            return
+        try:
+            self.backend.incr(f"{self.namespace}:generation")
+        except Exception:
+            self.errors += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "waits": self.waits, "fetches": self.fetches,
+                "errors": self.errors}
+
+
+def stats():
+    return {"backend": type(shared_backend).__name__ if shared_backend is not None else "none",
+            **{cache.namespace: cache.stats() for cache in _caches}}
@@ -0,0 +1,56 @@
+import json
+import os
+from functools import lru_cache
+
+import streamlit as st
+
+# Styles, lesson text and quiz questions live in content/ and are read once
+# per process; every rerun after the first renders them from memory.
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+
+TEXT_BLOCKS = {"header", "subheader", "write", "markdown", "caption", "info", "success", "warning", "error"}
+
+
+def _read(name):
+    with open(os.path.join(CONTENT_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def load_css():
+    return f"<style>\n{_read('styles.css')}</style>"
+
+
+@lru_cache(maxsize=None)
+def load_lessons():
+    """The Learn page as {'header': str, 'lessons': [{'title', 'expanded', 'blocks'}]}."""
+    return json.loads(_read("lessons.json"))
+
+
+@lru_cache(maxsize=None)
+def load_quiz():
+    """The quiz as {'header', 'intro', 'pass_score', 'parts': [{'title', 'questions'}]}.
+
+    Each question has a stable `id`, its `options` and the index of the
+    correct option in `answer`.
+    """
+    return json.loads(_read("quiz.json"))
+
+
+def render_blocks(blocks):
+    """Render a list of content blocks; `columns` blocks nest one list per column."""
+    for block in blocks:
+        kind = block["type"]
+        if kind in TEXT_BLOCKS:
+            getattr(st, kind)(block["text"])
+        elif kind == "divider":
+            st.divider()
+        elif kind == "link_button":
+            st.link_button(block["label"], block["url"])
+        elif kind == "columns":
+            for column, children in zip(st.columns(len(block["columns"])), block["columns"]):
+                with column:
+                    render_blocks(children)
+        else:
+            raise ValueError(f"unknown content block type: {kind!r}")
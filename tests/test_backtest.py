@@ -0,0 +1,35 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fixtures import offline  # noqa: E402
+
+
+def by_label(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def test_run_sweep_from_the_app():
+    # Under AppTest, as under `streamlit run`, __main__ is app.py while the
+    # page runs; the sweep pool is first started from inside it here.
+    from streamlit.testing.v1 import AppTest
+
+    import backtest
+    from market_data import ASSET_PAIRS
+    assert backtest._pool is None
+    with offline():
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+        at.secrets["gemini"] = {"api_key": "fixture"}
+        at.switch_page("views/market.py")
+        at.run()
+        by_label(at.toggle, "🧪 Backtest mode").set_value(True)
+        at.run()
+        at.button(key="backtest_sweep_button").click()
+        at.run()
+    assert not at.exception, at.exception[0].message if at.exception else None
+    results = at.session_state["backtest_sweep"]
+    assert set(results["symbol"]) == set(ASSET_PAIRS.values())
+    assert len(results) > 1000
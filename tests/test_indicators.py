@@ -0,0 +1,97 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import IndicatorEngine, calculate_rsi, calculate_sma, indicator_matrix  # noqa: E402
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(7)
+    index = pd.date_range("2025-01-01", periods=120, freq="D")
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(len(index), 3)), axis=0))
+    frame = pd.DataFrame(prices, index=index, columns=["BTC-USD", "ETH-USD", "SOL-USD"])
+    # A gap in one pair, as when Yahoo skips a bar for a single symbol.
+    frame.iloc[40:43, 1] = np.nan
+    return frame
+
+
+@pytest.mark.parametrize("sma_window, rsi_window", [(20, 14), (5, 3)])
+def test_indicator_matrix_matches_per_column_helpers(closes, sma_window, rsi_window):
+    sma, rsi = indicator_matrix(closes, sma_window, rsi_window)
+    assert list(sma.columns) == list(closes.columns)
+    assert sma.index.equals(closes.index) and rsi.index.equals(closes.index)
+    for symbol in closes.columns:
+        data = closes[[symbol]].rename(columns={symbol: "Close"})
+        np.testing.assert_allclose(sma[symbol].to_numpy(), calculate_sma(data, sma_window).to_numpy(),
+                                   rtol=1e-10, equal_nan=True)
+        np.testing.assert_allclose(rsi[symbol].to_numpy(), calculate_rsi(data, rsi_window).to_numpy(),
+                                   rtol=1e-10, equal_nan=True)
+
+
+def test_indicator_matrix_nan_gap_propagates_like_rolling(closes):
+    sma, _ = indicator_matrix(closes)
+    gap = closes.columns[1]
+    assert sma[gap].iloc[40:62].isna().all()
+    assert sma[gap].iloc[62:].notna().all()
+
+
+def test_indicator_matrix_accepts_arrays(closes):
+    sma, rsi = indicator_matrix(closes.to_numpy())
+    assert isinstance(sma, np.ndarray) and sma.shape == closes.shape
+    assert isinstance(rsi, np.ndarray) and rsi.shape == closes.shape
+
+
+# --- STREAMING ENGINE ---
+HELPERS = [("sma", calculate_sma, 20), ("rsi", calculate_rsi, 14)]
+
+
+def assert_matches_helper(values, close, helper, window):
+    expected = helper(close.to_frame("Close"), window)
+    assert values.index.equals(close.index)
+    np.testing.assert_allclose(values.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("indicator, helper, window", HELPERS)
+def test_engine_matches_helpers(closes, indicator, helper, window):
+    close = closes["BTC-USD"]
+    # A small capacity makes the stream grow its buffers along the way.
+    values = IndicatorEngine(capacity=16).compute("BTC-USD", close, indicator, window)
+    assert_matches_helper(values, close, helper, window)
+
+
+@pytest.mark.parametrize("indicator, helper, window", HELPERS)
+def test_engine_short_series_after_longer_one(closes, indicator, helper, window):
+    engine = IndicatorEngine()
+    close = closes["BTC-USD"]
+    engine.compute("BTC-USD", close, indicator, window)
+    short = close.iloc[-30:]
+    assert_matches_helper(engine.compute("BTC-USD", short, indicator, window), short, helper, window)
+
+
+@pytest.mark.parametrize("indicator, helper, window", HELPERS)
+def test_engine_append(closes, indicator, helper, window):
+    engine = IndicatorEngine()
+    close = closes["BTC-USD"]
+    engine.compute("BTC-USD", close.iloc[:-5], indicator, window)
+    for end in range(len(close) - 4, len(close) + 1):
+        assert_matches_helper(engine.compute("BTC-USD", close.iloc[:end], indicator, window), close.iloc[:end],
+                              helper, window)
+
+
+@pytest.mark.parametrize("indicator, helper, window", HELPERS)
+def test_engine_amend_latest_bar(closes, indicator, helper, window):
+    engine = IndicatorEngine()
+    close = closes["BTC-USD"].copy()
+    engine.compute("BTC-USD", close, indicator, window)
+    for tick in (1.01, 0.97):
+        close.iloc[-1] *= tick
+        assert_matches_helper(engine.compute("BTC-USD", close, indicator, window), close, helper, window)
+    # The amended bar closes and a new one opens.
+    grown = pd.concat([close, pd.Series([close.iloc[-1] * 1.02], index=[close.index[-1] + pd.Timedelta(days=1)])])
+    assert_matches_helper(engine.compute("BTC-USD", grown, indicator, window), grown, helper, window)
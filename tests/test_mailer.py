@@ -0,0 +1,72 @@
+import os
+import socket
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fixtures import FixtureSMTPServer  # noqa: E402
+from mailer import MailQueue  # noqa: E402
+
+
+class DroppingSMTPServer(FixtureSMTPServer):
+    """FixtureSMTPServer that can hang up on every open connection."""
+
+    def __init__(self):
+        super().__init__()
+        self.connections = []
+
+    def process_request(self, request, client_address):
+        self.connections.append(request)
+        super().process_request(request, client_address)
+
+    def drop_connections(self):
+        for connection in self.connections:
+            connection.shutdown(socket.SHUT_RDWR)
+        self.connections.clear()
+
+
+@pytest.fixture
+def smtp():
+    with DroppingSMTPServer() as server:
+        yield server
+
+
+def mail_queue(host, port, **options):
+    return MailQueue("academy@example.com", "", "team@example.com", host=host, port=port, starttls=False,
+                     backoff=0, timeout=5, **options)
+
+
+def test_messages_share_one_connection(smtp):
+    mail = mail_queue(*smtp.server_address)
+    for i in range(3):
+        assert mail.submit(f"student{i}@example.com", "Hello")
+    mail.join()
+    assert smtp.messages == 3
+    assert mail.stats() == {"pending": 0, "sent": 3, "failed": 0, "retries": 0, "connects": 1}
+
+
+def test_reconnects_after_the_server_hangs_up(smtp):
+    mail = mail_queue(*smtp.server_address)
+    mail.submit("student@example.com", "First")
+    mail.join()
+    smtp.drop_connections()
+    mail.submit("student@example.com", "Second")
+    mail.join()
+    assert smtp.messages == 2
+    assert (mail.sent, mail.failed, mail.retries, mail.connects) == (2, 0, 1, 2)
+
+
+def test_retries_then_gives_up():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        host, port = s.getsockname()
+    # Nothing listens there any more: every attempt is refused.
+    mail = mail_queue(host, port, max_retries=2)
+    mail.submit("student@example.com", "Hello")
+    mail.join()
+    assert (mail.sent, mail.failed, mail.retries, mail.connects) == (0, 1, 2, 0)
+
@@ -0,0 +1,138 @@
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_state import LocalBackend, RedisBackend, SharedCache  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The part of the redis-py client RedisBackend uses, in memory."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}   # key -> (value, expires_at or None)
+        self.lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= self.clock():
+            del self.data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self.lock:
+            entry = self._live(key)
+            return entry[0] if entry is not None else None
+
+    def set(self, key, value, px=None, nx=False):
+        with self.lock:
+            if nx and self._live(key) is not None:
+                return None
+            self.data[key] = (value, self.clock() + px / 1000 if px else None)
+            return True
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        with self.lock:
+            entry = self._live(key)
+            value = int(entry[0]) + 1 if entry is not None else 1
+            self.data[key] = (str(value).encode(), entry[1] if entry is not None else None)
+            return value
+
+
+class DownRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("redis is down")
+        return fail
+
+
+@pytest.fixture(params=["local", "redis"])
+def make_backend(request):
+    def make(clock=time.monotonic):
+        return LocalBackend(clock) if request.param == "local" else RedisBackend(FakeRedis(clock))
+    return make
+
+
+def test_concurrent_misses_fetch_once(make_backend):
+    cache = SharedCache("test", ttl=60, backend=make_backend(), poll=0.01)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"price": 1}
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("btc", fetch))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{"price": 1}] * 4
+    assert len(calls) == 1
+    assert cache.stats()["waits"] == 3
+
+
+def test_entries_expire(make_backend):
+    clock = Clock()
+    cache = SharedCache("test", ttl=30, backend=make_backend(clock))
+    cache.put("btc", [1, 2, 3])
+    clock.now += 29
+    assert cache.get("btc") == [1, 2, 3]
+    clock.now += 2
+    assert cache.get("btc") is None
+
+
+def test_invalidate_bumps_generation_for_every_worker(make_backend):
+    backend = make_backend()
+    worker_a = SharedCache("test", ttl=60, backend=backend)
+    worker_b = SharedCache("test", ttl=60, backend=backend)
+    worker_a.put("btc", "old")
+    assert worker_b.get("btc") == "old"
+    worker_a.invalidate()
+    assert worker_b.get("btc") is None
+    assert worker_b.get_or_fetch("btc", lambda: "new") == "new"
+    assert worker_a.get("btc") == "new"
+
+
+def test_frames_round_trip_as_arrow(make_backend):
+    pytest.importorskip("pyarrow")
+    cache = SharedCache("test", ttl=60, backend=make_backend())
+    index = pd.date_range("2025-01-01", periods=5, freq="D", name="Date")
+    frame = pd.DataFrame({"Close": [1.0, 2.5, 3.0, 2.0, 4.5], "Volume": [10, 20, 30, 40, 50]}, index=index)
+    cache.put("btc", frame)
+    pd.testing.assert_frame_equal(cache.get("btc"), frame, check_freq=False)
+
+
+def test_empty_values_are_not_shared(make_backend):
+    cache = SharedCache("test", ttl=60, backend=make_backend())
+    cache.put("btc", pd.DataFrame())
+    cache.put("eth", [])
+    assert cache.get("btc") is None and cache.get("eth") is None
+
+
+def test_backend_outage_falls_back_to_fetch():
+    cache = SharedCache("test", ttl=60, backend=RedisBackend(DownRedis()))
+    assert cache.get_or_fetch("btc", lambda: "fresh") == "fresh"
+    assert cache.get("btc") is None
+    cache.put("btc", "fresh")
+    cache.invalidate()
+    assert cache.stats()["errors"] == 4
@@ -0,0 +1,88 @@
+import hmac
+import sys
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from metrics import metrics
+from quiz_store import attempt_store, question_report
+from static_content import load_quiz
+
+# ==========================================
+# ADMIN (hidden, /admin)
+# ==========================================
+if "admin" not in st.secrets or "password" not in st.secrets["admin"]:
+    st.info("The admin panel is disabled. Set `password` under `[admin]` in the secrets to enable it.")
+    st.stop()
+if not st.session_state.get("admin_ok"):
+    password = st.text_input("Admin password", type="password")
+    if not hmac.compare_digest(password.encode(), st.secrets["admin"]["password"].encode()):
+        if password:
+            st.error("Wrong password.")
+        st.stop()
+    st.session_state.admin_ok = True
+
+st.header("🛠️ Performance")
+st.button("↻ Refresh")
+
+# --- SPAN PERCENTILES ---
+st.subheader("Spans")
+summary = metrics.summary()
+if summary:
+    spans = pd.DataFrame(summary).T
+    for column in ("p50", "p95", "p99", "max", "total"):
+        spans[column] = spans[column] * 1000
+    spans = spans.rename(columns={c: f"{c} (ms)" for c in ("p50", "p95", "p99", "max", "total")})
+    st.dataframe(spans, use_container_width=True)
+else:
+    st.caption("No spans recorded yet.")
+
+# --- PER-RERUN BREAKDOWN ---
+st.subheader("Recent reruns")
+recent = metrics.recent_reruns()[::-1]
+if recent:
+    rows = [{"time": datetime.fromtimestamp(r["started"]).strftime("%H:%M:%S"), "page": r["page"],
+             "total": r["total"] * 1000, **{name: seconds * 1000 for name, seconds in r["spans"].items()}}
+            for r in recent]
+    reruns = pd.DataFrame(rows).fillna(0.0)
+    span_columns = [c for c in reruns.columns if c not in ("time", "page", "total")]
+    reruns["other"] = (reruns["total"] - reruns[span_columns].sum(axis=1)).clip(lower=0)
+    st.caption("Milliseconds per rerun; `other` is script time outside any span.")
+    st.bar_chart(reruns.head(30)[::-1][span_columns + ["other"]])
+    st.dataframe(reruns, use_container_width=True, hide_index=True)
+else:
+    st.caption("No reruns recorded yet.")
+
+# --- QUIZ ANALYTICS ---
+# Read from the running aggregates the attempt writer maintains, not the log.
+st.subheader("Quiz")
+report = question_report(load_quiz(), attempt_store)
+if not report.empty:
+    st.caption(f"{attempt_store.pending()} attempts waiting to be written.")
+    st.bar_chart(report.set_index("question")["error_rate"])
+    st.dataframe(report.assign(error_rate=report["error_rate"] * 100, skipped=report["skipped"] * 100)
+                 .rename(columns={"error_rate": "error rate (%)", "skipped": "skipped (%)"}),
+                 use_container_width=True, hide_index=True)
+    st.bar_chart(attempt_store.score_distribution())
+else:
+    st.caption("No quiz attempts recorded yet.")
+
+# --- SUBSYSTEM COUNTERS ---
+# Only subsystems some session has already loaded; the panel never imports them.
+SUBSYSTEM_STATS = {
+    "market_data": lambda m: m.cache_stats(),
+    "charts": lambda m: m.figure_cache.stats(),
+    "comparison": lambda m: m.comparison_cache.stats(),
+    "assistant": lambda m: m.chat_responder.stats(),
+    "quiz_store": lambda m: m.attempt_store.stats(),
+    "shared_state": lambda m: m.stats(),
+    "news": lambda m: {"fetches": m.news_service.fetches, "not_modified": m.news_service.not_modified,
+                       "failures": m.news_service.failures, "timeouts": m.news_service.timeouts},
+}
+with st.expander("Subsystem counters"):
+    for name, stats in SUBSYSTEM_STATS.items():
+        module = sys.modules.get(name)
+        if module is not None:
+            st.write(f"**{name}**")
+            st.json(stats(module))
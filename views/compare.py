@@ -0,0 +1,64 @@
+import numpy as np
+import streamlit as st
+
+from charts import build_correlation_heatmap, build_lines_figure
+from comparison import DEFAULT_WINDOW, ROLLING_WINDOWS, comparison_cache
+from market_data import ASSET_PAIRS, TIMEFRAMES, close_matrix, start_prefetcher
+from metrics import metrics
+
+# ==========================================
+# COMPARE PAIRS
+# ==========================================
+# --- MARKET DATA PREFETCH (shared by all sessions) ---
+start_prefetcher()
+
+st.header("📊 Compare All Pairs")
+st.write("How do the six pairs move relative to each other? All series use daily closes.")
+
+c_time, c_window = st.columns(2)
+with c_time:
+    timeframe = st.selectbox("Timeframe", TIMEFRAMES, index=TIMEFRAMES.index("1y"))
+with c_window:
+    window = st.selectbox("Rolling window (days)", ROLLING_WINDOWS, index=ROLLING_WINDOWS.index(DEFAULT_WINDOW))
+
+try:
+    with metrics.span("market_fetch"):
+        closes = close_matrix(timeframe, ASSET_PAIRS.values())
+    with metrics.span("comparison"):
+        view = comparison_cache.get(timeframe, window, closes)
+except Exception as e:
+    st.error(f"Error loading market data: {e}")
+    st.stop()
+
+if len(view["dates"]) < window:
+    st.warning(f"Not enough history for a {window}-day window yet.")
+    st.stop()
+
+# 1. Normalized returns
+st.plotly_chart(build_lines_figure(view["normalized"], "Growth of 100 (normalized)", "Value"),
+                use_container_width=True)
+with st.expander("📘 How to Read This"):
+    st.write("Every pair starts at **100** on the first day, so the lines compare percentage moves, not prices.")
+    st.write("* A line at **150** gained 50% over the timeframe; at **80** it lost 20%.")
+
+# 2. Rolling correlation
+st.subheader("🔗 Rolling Correlation")
+dates = view["dates"][window - 1:]
+as_of = st.select_slider("Window ending", options=list(dates), value=dates[-1],
+                         format_func=lambda ts: ts.strftime("%Y-%m-%d"))
+matrix = view["correlation"][view["dates"].get_loc(as_of)]
+c_heat, c_note = st.columns([2, 1])
+with c_heat:
+    st.plotly_chart(build_correlation_heatmap(np.round(matrix, 2), view["symbols"],
+                                              f"{window}-day correlation of daily returns"),
+                    use_container_width=True)
+with c_note:
+    st.info("💡 **+1** means two pairs move together, **0** means unrelated, **-1** means opposite.")
+    st.write("When everything is close to +1, holding several coins does not spread your risk much.")
+
+# 3. Rolling volatility
+st.subheader("🌪️ Rolling Volatility")
+st.plotly_chart(build_lines_figure(view["volatility"].iloc[window - 1:] * 100,
+                                   f"{window}-day volatility (annualized)", "Volatility %"),
+                use_container_width=True)
+st.caption("Annualized standard deviation of daily log returns. Higher means wilder price swings.")
@@ -0,0 +1,19 @@
+import streamlit as st
+
+# ==========================================
+# COVER
+# ==========================================
+c1, c2, c3 = st.columns([1, 2, 1])
+with c2:
+    st.write("")
+    st.write("")
+    st.write("")
+    st.write("")
+    st.title("BIT SOLUTIONS ACADEMY")
+    st.markdown("<h3 style='text-align: left; color: #00BFA5 !important;'>Master the Future of Finance.</h3>", unsafe_allow_html=True)
+    st.write("Welcome to the next generation of financial education. Learn how Blockchain, Smart Contracts, and DeFi are rewriting the rules of money.")
+    st.write("")
+    st.write("---")
+    st.write("")
+    if st.button("🚀 Enter Academy"):
+        st.switch_page("views/news_feed.py")
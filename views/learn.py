@@ -0,0 +1,12 @@
+import streamlit as st
+
+from static_content import load_lessons, render_blocks
+
+# ==========================================
+# LEARN CONCEPTS
+# ==========================================
+content = load_lessons()
+st.header(content["header"])
+for lesson in content["lessons"]:
+    with st.expander(lesson["title"], expanded=lesson["expanded"]):
+        render_blocks(lesson["blocks"])
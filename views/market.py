@@ -0,0 +1,222 @@
+import streamlit as st
+import streamlit.components.v1 as components
+
+from market_data import (ASSET_PAIRS, INTERVALS, INTRADAY_TIMEFRAMES, TIMEFRAMES, get_bars,
+                         rolling_24h_range, start_prefetcher)
+from metrics import metrics
+
+# --- LIVE MARKET: KPI ROW & CHART ---
+def add_indicators(df, stream_key):
+    from indicators import indicator_engine
+    with metrics.span("indicators"):
+        df['SMA_20'] = indicator_engine.sma(stream_key, df['Close'], window=20)
+        df['RSI'] = indicator_engine.rsi(stream_key, df['Close'], window=14)
+    return df
+
+def render_kpis(df, day_high, day_low, range_label):
+    curr_price = df['Close'].iloc[-1]
+    prev_price = df['Close'].iloc[-2]
+    price_change = curr_price - prev_price
+    pct_change = (price_change / prev_price) * 100
+    current_rsi = df['RSI'].iloc[-1]
+
+    kpi1, kpi2, kpi3, kpi4 = st.columns(4)
+    kpi1.metric("Current Price", f"${curr_price:,.2f}", f"{pct_change:.2f}%")
+    kpi2.metric(f"{range_label} High", f"${day_high:,.2f}")
+    kpi3.metric(f"{range_label} Low", f"${day_low:,.2f}")
+
+    # RSI Logic Badge
+    rsi_state = "Neutral 😐"
+    if current_rsi > 70: rsi_state = "Overbought (Sell Risk) 🔴"
+    elif current_rsi < 30: rsi_state = "Oversold (Buy Opp) 🟢"
+    kpi4.metric("RSI (14)", f"{current_rsi:.1f}", rsi_state, delta_color="off")
+
+def render_chart(df, ticker_symbol, timeframe, interval, chart_type, live=False):
+    from charts import figure_cache
+    # Covers the figure build/patch and Plotly's serialization in st.plotly_chart.
+    with metrics.span("figure_build"), \
+            figure_cache.figure(ticker_symbol, timeframe, interval, chart_type, df, live) as fig:
+        st.plotly_chart(fig, use_container_width=True)
+
+# Live mode: these run as fragments, so a tick re-executes only them.
+def live_bars(df, ticker_symbol, interval):
+    from live_feed import apply_tick, live_feed
+    tick = live_feed.latest(ticker_symbol)
+    live_df = apply_tick(df, tick, interval)
+    if live_df is not df:
+        add_indicators(live_df, f"{ticker_symbol}@{interval}")
+    return live_df, tick
+
+def live_kpis(df, ticker_symbol, interval, day_high, day_low, range_label):
+    live_df, tick = live_bars(df, ticker_symbol, interval)
+    if tick:
+        day_high, day_low = max(day_high, tick['high']), min(day_low, tick['low'])
+    render_kpis(live_df, day_high, day_low, range_label)
+
+def live_chart(df, ticker_symbol, timeframe, interval, chart_type):
+    live_df, _ = live_bars(df, ticker_symbol, interval)
+    # The whole figure is re-sent on every tick; only its build is incremental.
+    render_chart(live_df, ticker_symbol, timeframe, interval, chart_type, live=True)
+
+# --- BACKTEST MODE ---
+RULE_LABELS = {"rsi": "RSI badge (buy oversold, sell overbought)", "sma": "Trend (long above SMA)"}
+
+def render_backtest(df, ticker_symbol, interval):
+    from backtest import (FEE_BPS, PERIODS_PER_YEAR, RSI_BUY, RSI_SELL, SMA_WINDOW, STAT_COLUMNS,
+                          run_rule, sweep)
+    from charts import build_backtest_figure, build_sweep_heatmap
+    from market_data import close_matrix
+
+    st.subheader("🧪 Backtest: Do the Dashboard Rules Work?")
+    st.caption("Each signal is taken at a bar's close and held over the next bar, on the history charted above.")
+    c_rule, c_a, c_b, c_fee = st.columns([2, 1, 1, 1])
+    with c_rule:
+        rule = st.radio("Rule", list(RULE_LABELS), format_func=RULE_LABELS.get, horizontal=True)
+    if rule == "rsi":
+        params = {"buy": c_a.number_input("Buy below RSI", 1, 99, RSI_BUY),
+                  "sell": c_b.number_input("Sell above RSI", 1, 99, RSI_SELL)}
+    else:
+        params = {"window": c_a.number_input("SMA window", 2, 200, SMA_WINDOW)}
+    fee_bps = c_fee.number_input("Fee per trade (bps)", 0.0, 100.0, FEE_BPS, step=1.0)
+
+    with metrics.span("backtest"):
+        result, stats = run_rule(df['Close'], rule, fee=fee_bps / 1e4,
+                                 periods_per_year=PERIODS_PER_YEAR[interval], **params)
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Strategy Return", f"{stats['total_return']:.1%}",
+              f"{stats['total_return'] - stats['buy_hold_return']:+.1%} vs hold")
+    k2.metric("Buy & Hold", f"{stats['buy_hold_return']:.1%}")
+    k3.metric("Max Drawdown", f"{stats['max_drawdown']:.1%}")
+    k4.metric("Trades", f"{stats['trades']:.0f}", f"{stats['exposure']:.0%} of the time in market", delta_color="off")
+    st.plotly_chart(build_backtest_figure(result), use_container_width=True)
+
+    st.write("**Parameter sweep:** every RSI buy/sell threshold pair (RSI 7, 14 and 21) and every SMA window "
+             "from 5 to 200, on one year of daily bars for all six pairs.")
+    if st.button("Run Sweep", key="backtest_sweep_button"):
+        with st.spinner("Sweeping thousands of combinations..."):
+            st.session_state.backtest_sweep = sweep(close_matrix(), fee=fee_bps / 1e4)
+    results = st.session_state.get("backtest_sweep")
+    if results is not None:
+        st.caption(f"{len(results):,} combinations, best total return first.")
+        st.dataframe(results.head(20)[["symbol", "rule", "window", "buy", "sell", *STAT_COLUMNS]],
+                     hide_index=True, use_container_width=True)
+        rsi14 = results[(results["symbol"] == ticker_symbol) & (results["rule"] == "rsi") & (results["window"] == 14)]
+        if not rsi14.empty:
+            st.plotly_chart(build_sweep_heatmap(rsi14, f"{ticker_symbol}: RSI(14) return by threshold"),
+                            use_container_width=True)
+
+
+# ==========================================
+# LIVE MARKET
+# ==========================================
+# --- MARKET DATA PREFETCH (shared by all sessions) ---
+start_prefetcher()
+
+st.header("💎 Professional Market Terminal")
+
+# 1. Top Controls
+c_sel, c_int, c_time, c_type = st.columns([2, 1, 1, 1])
+with c_sel:
+    coin_opt = st.selectbox("Select Asset Pair:", list(ASSET_PAIRS))
+    ticker_symbol = ASSET_PAIRS[coin_opt] # e.g. "BTC-USD"
+with c_int:
+    interval = st.selectbox("Interval", INTERVALS, index=INTERVALS.index("1d"))
+with c_time:
+    timeframe = st.selectbox("Timeframe", TIMEFRAMES if interval == "1d" else INTRADAY_TIMEFRAMES, index=1)
+with c_type:
+    chart_type = st.selectbox("Chart Type", ["Candlestick", "Line"])
+c_live, c_rate, c_test = st.columns([1, 2, 1])
+with c_live:
+    live_mode = st.toggle("⚡ Live mode", help="Stream prices into the KPIs and the last candle.")
+with c_rate:
+    live_rate = st.select_slider("Refresh every", options=[2, 5, 10, 30], value=5,
+                                 format_func=lambda s: f"{s}s", disabled=not live_mode)
+with c_test:
+    backtest_mode = st.toggle("🧪 Backtest mode", help="Test the RSI and SMA rules on this history.")
+
+# 2. Data Fetching
+try:
+    with metrics.span("market_fetch"):
+        df = get_bars(ticker_symbol, timeframe, interval)
+    
+    if not df.empty:
+        # Calculate Indicators
+        add_indicators(df, f"{ticker_symbol}@{interval}")
+        
+        # Current Metrics
+        # The trailing 24h range needs the 1m base, which only intraday views
+        # have already fetched; the daily view shows its last bar as the day's
+        # range, and a failed read falls back to the last bar, labelled as such.
+        day_range = None
+        if interval != "1d":
+            try:
+                with metrics.span("market_fetch"):
+                    day_range = rolling_24h_range(ticker_symbol)
+            except Exception:
+                day_range = None
+        day_high, day_low = day_range or (df['High'].iloc[-1], df['Low'].iloc[-1])
+        range_label = "24h" if day_range else "Day" if interval == "1d" else "Last Bar"
+
+        # 3. KPI Row
+        if live_mode:
+            st.fragment(live_kpis, run_every=live_rate)(df, ticker_symbol, interval, day_high, day_low,
+                                                        range_label)
+        else:
+            render_kpis(df, day_high, day_low, range_label)
+
+        # <--- EDUCATIONAL GUIDE --->
+        with st.expander("📘 How to Read These Charts"):
+            st.write("**1. Candlesticks (The Bars):**")
+            st.caption("Each bar shows the price movement for one day.")
+            st.write("* **Green Candle:** Price went UP (Closed higher than it opened).")
+            st.write("* **Red Candle:** Price went DOWN (Closed lower than it opened).")
+            st.write("* **Wicks (Lines):** The highest and lowest price reached that day.")
+            st.divider()
+            st.write("**2. SMA (Simple Moving Average) - The Orange Line:**")
+            st.caption("This smoothes out the price action to show the trend.")
+            st.write("* **Price Above Orange Line:** Generally considered an **UPTREND** (Bullish).")
+            st.write("* **Price Below Orange Line:** Generally considered a **DOWNTREND** (Bearish).")
+            st.divider()
+            st.write("**3. RSI (Relative Strength Index) - The Purple Graph:**")
+            st.caption("This measures momentum (speed of price change) on a scale of 0 to 100.")
+            c_rsi1, c_rsi2 = st.columns(2)
+            with c_rsi1:
+                st.error("🔴 Overbought (>70)")
+                st.write("The price rose too fast. Traders might sell soon. **Risk of Drop.**")
+            with c_rsi2:
+                st.success("🟢 Oversold (<30)")
+                st.write("The price fell too hard. Traders might buy. **Potential Bounce.**")
+        # <--- END GUIDE --->
+
+        st.markdown("---")
+
+        # 4. Professional Charting (Plotly)
+        if live_mode:
+            st.fragment(live_chart, run_every=live_rate)(df, ticker_symbol, timeframe, interval, chart_type)
+        else:
+            render_chart(df, ticker_symbol, timeframe, interval, chart_type)
+
+        # 5. Backtest of the dashboard's rules
+        if backtest_mode:
+            st.markdown("---")
+            render_backtest(df, ticker_symbol, interval)
+
+    else:
+        st.warning("Loading data...")
+except Exception as e:
+    st.error(f"Error loading market data: {e}")
+
+# 6. TradingView Widget (Bottom for Quick Reference)
+with st.expander("🌍 View Global TradingView Chart"):
+    tv_sym = ticker_symbol.replace("-", "") # Convert BTC-USD to BTCUSD
+    components.html(f"""
+    <div class="tradingview-widget-container">
+      <div id="tradingview_chart"></div>
+      <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
+      <script type="text/javascript">
+      new TradingView.widget(
+      {{ "width": "100%", "height": 500, "symbol": "COINBASE:{tv_sym}", "interval": "D", "timezone": "Etc/UTC", "theme": "dark", "style": "1", "locale": "en", "toolbar_bg": "#f1f3f6", "enable_publishing": false, "allow_symbol_change": true, "container_id": "tradingview_chart" }}
+      );
+      </script>
+    </div>
+    """, height=510)
@@ -0,0 +1,32 @@
+import streamlit as st
+
+from metrics import metrics
+from news import NEWS_SOURCES, get_crypto_news
+
+# ==========================================
+# CRYPTO NEWS
+# ==========================================
+st.header("⚡ Global Crypto News")
+st.write("Live feed from " + ", ".join(f"**{source.name}**" for source in NEWS_SOURCES) + ".")
+col_news1, col_news2 = st.columns([2, 1])
+with col_news1:
+    st.subheader("Latest Headlines")
+    with metrics.span("news_fetch"):
+        news_list = get_crypto_news()
+    if news_list:
+        for item in news_list:
+            with st.container():
+                st.markdown(f"#### [{item['title']}]({item['link']})")
+                st.caption(f"**{item['source']}** | 🕒 {item['pubDate']}")
+                st.markdown("---")
+    else:
+        st.info("Loading news... (If this takes too long, check connection)")
+with col_news2:
+    st.subheader("Educational: How to Read News")
+    with st.expander("🟢 Bullish vs 🔴 Bearish"):
+        st.write("**Bullish:** Good news (Adoption, New Tech). Price often goes UP.")
+        st.write("**Bearish:** Bad news (Hacks, Bans). Price often goes DOWN.")
+    with st.expander("⚠️ FUD vs. FOMO"):
+        st.write("**FUD:** Fake fear to make you sell.")
+        st.write("**FOMO:** Fake hype to make you buy.")
+    st.info("💡 **Pro Tip:** Never trade immediately on a headline. Wait 15 minutes.")
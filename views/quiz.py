@@ -0,0 +1,33 @@
+import streamlit as st
+
+from quiz_store import answer_key, attempt_store, choice_indices, score_attempts
+from static_content import load_quiz
+
+# ==========================================
+# KNOWLEDGE QUIZ
+# ==========================================
+quiz = load_quiz()
+question_ids, key = answer_key(quiz)
+total = len(question_ids)
+
+st.header(quiz["header"])
+st.write(quiz["intro"])
+with st.form("quiz_form"):
+    choices = []
+    for part in quiz["parts"]:
+        st.subheader(part["title"])
+        for question in part["questions"]:
+            choices.append(st.radio(question["text"], question["options"], index=None, key=f"quiz_{question['id']}"))
+        st.markdown("---")
+    submitted = st.form_submit_button("Submit Answers")
+    if submitted:
+        picked = choice_indices(quiz, choices)
+        correct, score = score_attempts(picked, key)
+        attempt_store.record(question_ids, picked, correct)
+        if score == total:
+            st.balloons()
+            st.success(f"🏆 PERFECT SCORE! {total}/{total}. You are a true Crypto Master.")
+        elif score >= quiz["pass_score"]:
+            st.success(f"✅ Great Job! You got {score}/{total}. You are ready to start.")
+        else:
+            st.error(f"⚠️ You got {score}/{total}. Please review the lessons and try again.")